@@ -0,0 +1,288 @@
+"""
+命令行模式：不启动界面，使用已保存的项目、账号和 AI 设置生成工作总结，可用于定时任务或 CI。
+
+    python -m src.cli                       # 今日，输出到标准输出
+    python -m src.cli 上周 -o weekly.md
+    python -m src.cli --since 2025-07-01 --until 2025-07-15 -p work_report -a 张三
+    python -m src.cli 本月 --log-only       # 只输出提交记录，不调用 AI
+    python -m src.cli 本年 --warm-cache     # 输出后等待提交缓存建立完成再退出
+
+默认使用界面中勾选的项目分支和账号；通过 -p/-a 指定时以指定的为准。
+"""
+import argparse
+import os
+import signal
+import sys
+
+import pendulum
+from PySide6.QtCore import QCoreApplication, QObject, QThreadPool, QTimer
+
+from src.config.config import Config
+from src.config.workspace import Workspace
+from src.utils.ai_client import close_clients, set_max_connections
+from src.utils.ai_payload import build_compact_payload, estimate_tokens, format_commit_log
+from src.utils.ai_report import MapReduceReportManager, PerAuthorReportManager, order_authors, choose_report_mode
+from src.utils.ai_scheduler import configure_scheduler
+from src.utils.ai_task import AITask
+from src.utils.commit_cache import CommitCache
+from src.utils.date_range import DATE_OPTIONS, CUSTOM_PERIOD, get_date_range, git_time_range
+from src.utils.git_log_worker import GitLogManager
+from src.utils.summary_cache import SummaryCache, summary_key
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_CANCELLED = 130
+
+
+def log(message):
+    """进度和错误信息输出到标准错误，标准输出只用于报告内容"""
+    print(message, file=sys.stderr, flush=True)
+
+
+def load_project_map(names=None):
+    """
+    读取项目及其勾选的本地分支，返回 {name: {"path", "branches"}}。
+    names 指定项目时只取这些项目；其中没有勾选分支的项目使用上次缓存的全部分支。
+    """
+    project_map = {}
+    for project in Workspace().projects():
+        if names and project.name not in names:
+            continue
+        if not os.path.exists(project.path):
+            log(f"跳过项目 [{project.name}]：路径不存在")
+            continue
+        branches = [ref.split('/', 1)[1] for ref in sorted(project.checked) if ref.startswith('local/')]
+        if not branches and names:
+            branches = project.branches
+        if branches:
+            project_map[project.name] = {"path": project.path, "branches": branches}
+    return project_map
+
+
+def load_checked_accounts():
+    """按账号列表顺序返回勾选的账号"""
+    return [account.name for account in Workspace().accounts() if account.checked]
+
+
+def parse_date(text):
+    try:
+        return pendulum.from_format(text, 'YYYY-MM-DD').date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"日期格式应为 YYYY-MM-DD：{text}")
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='work_report', description='根据 git 提交记录生成工作总结')
+    parser.add_argument('period', nargs='?', default='今日',
+                        choices=[option for option in DATE_OPTIONS if option != CUSTOM_PERIOD],
+                        help='时间段，默认今日；指定 --since/--until 时忽略')
+    parser.add_argument('--since', type=parse_date, help='起始日期 YYYY-MM-DD')
+    parser.add_argument('--until', type=parse_date, help='结束日期 YYYY-MM-DD，默认今天')
+    parser.add_argument('-p', '--project', action='append', help='项目名称，可重复指定，默认使用勾选的项目分支')
+    parser.add_argument('-a', '--author', action='append', help='账号名称，可重复指定，默认使用勾选的账号')
+    parser.add_argument('-o', '--output', help='报告写入的文件，默认输出到标准输出')
+    parser.add_argument('--mode', choices=['single', 'per_author'], help='生成方式，默认使用设置中的选项')
+    parser.add_argument('--log-only', action='store_true', help='只输出整理后的提交记录，不调用 AI')
+    parser.add_argument('--warm-cache', action='store_true',
+                        help='输出报告后等待首次使用的分支建立提交缓存再退出，之后的运行可以直接查询缓存')
+    return parser.parse_args(argv)
+
+
+class ReportJob(QObject):
+    """
+    一次命令行报告生成：收集提交记录，再按设置选择整体、分段或按开发者生成报告。
+    与界面使用相同的 GitLogManager、AITask、报告管理器和缓存。
+    """
+
+    def __init__(self, args, project_map, authors, since, until):
+        super().__init__()
+        self.args = args
+        self.project_map = project_map
+        self.authors = authors
+        self.since = since
+        self.until = until
+        self.grouped_logs = {}
+        self.errors = []
+        self.thread_pool = QThreadPool()
+        self.commit_cache = CommitCache()
+        self.summary_cache = SummaryCache()
+        self.report_task = None
+        self.exit_code = None
+        self.git_log_manager = GitLogManager(max_threads=int(Config().get('settings/git_threads', 0)),
+                                             commit_cache=self.commit_cache)
+        self.git_log_manager.log_collected.connect(self.on_log_collected)
+        self.git_log_manager.error.connect(self.on_log_error)
+        self.git_log_manager.progress.connect(self.on_progress)
+        self.git_log_manager.finished.connect(self.on_collected)
+
+    def start(self):
+        log(f"收集提交记录：{self.since} ~ {self.until}，{len(self.project_map)} 个项目，{len(self.authors)} 个账号")
+        self.git_log_manager.start(self.project_map, self.authors, self.since, self.until)
+
+    def cancel(self):
+        self.git_log_manager.shutdown()
+        if self.report_task is not None:
+            self.report_task.cancel()
+        log("已停止")
+        self.finish(EXIT_CANCELLED)
+
+    def finish(self, code):
+        if self.exit_code is not None:
+            return
+        self.exit_code = code
+        self.summary_cache.close()
+        QCoreApplication.exit(code)
+
+    def on_log_collected(self, project, branch, author, logs):
+        self.grouped_logs.setdefault((project, branch, author), []).extend(logs)
+
+    def on_log_error(self, message):
+        self.errors.append(message)
+        log(message)
+
+    @staticmethod
+    def on_progress(done, total):
+        log(f"收集进度 {done}/{total}")
+
+    def on_collected(self):
+        if not any(self.grouped_logs.values()):
+            log("所选时间段内没有提交记录")
+            self.finish(EXIT_ERROR if self.errors else EXIT_OK)
+            return
+        if self.args.log_only:
+            self.write(format_commit_log(self.grouped_logs))
+            return
+        self.generate_report()
+
+    def generate_report(self):
+        api_key = Config().get('settings/key', '')
+        api_url = Config().get('settings/address', '')
+        api_model = Config().get('settings/model', '')
+        prompt = Config().get('settings/prompt', '')
+
+        git_log = build_compact_payload(self.grouped_logs)
+        tokens = estimate_tokens(prompt) + estimate_tokens(git_log)
+        log(f"AI 总结输入约 {tokens} tokens")
+
+        authors = order_authors(self.grouped_logs, self.authors)
+        max_context_tokens = int(Config().get('settings/max_context_tokens', 24000))
+        report_mode = self.args.mode or Config().get('settings/report_mode', 'single')
+        mode = choose_report_mode(report_mode, len(authors), tokens, max_context_tokens)
+        ai_threads = int(Config().get('settings/ai_threads', 4))
+
+        if mode == 'per_author':
+            self.report_task = PerAuthorReportManager(api_key, api_url, api_model, prompt, max_threads=ai_threads,
+                                                      summary_cache=self.summary_cache,
+                                                      max_context_tokens=max_context_tokens)
+            self.report_task.progress.connect(lambda done, total: log(f"按开发者生成 {done}/{total}"))
+            self.report_task.success.connect(self.write)
+            self.report_task.error.connect(self.on_report_error)
+            self.report_task.start(self.grouped_logs, authors)
+            return
+
+        if mode == 'map_reduce':
+            self.report_task = MapReduceReportManager(api_key, api_url, api_model, prompt,
+                                                      max_chunk_tokens=max_context_tokens // 4,
+                                                      max_threads=ai_threads, summary_cache=self.summary_cache,
+                                                      max_context_tokens=max_context_tokens)
+            self.report_task.progress.connect(lambda done, total: log(f"分段总结 {done}/{total}"))
+            self.report_task.success.connect(self.write)
+            self.report_task.error.connect(self.on_report_error)
+            self.report_task.start(self.grouped_logs)
+            return
+
+        cache_key = summary_key(api_model, prompt, git_log)
+        cached = self.summary_cache.get(cache_key)
+        if cached is not None:
+            self.write(cached)
+            return
+        self.report_task = AITask(api_key, api_url, api_model, prompt, git_log)
+        self.report_task.signals.success.connect(lambda reply: self.summary_cache.put(cache_key, reply))
+        self.report_task.signals.success.connect(self.write)
+        self.report_task.signals.error.connect(self.on_report_error)
+        self.thread_pool.start(self.report_task)
+
+    def on_report_error(self, message):
+        log(f"总结失败：\n{message}")
+        self.finish(EXIT_ERROR)
+
+    def write(self, text):
+        if self.exit_code is not None:
+            return
+        try:
+            if self.args.output:
+                with open(self.args.output, 'w', encoding='utf-8') as f:
+                    f.write(text)
+                log(f"已写入 {self.args.output}")
+            else:
+                sys.stdout.write(text.rstrip('\n') + '\n')
+                sys.stdout.flush()
+        except OSError as e:
+            log(f"写入失败：{e}")
+            self.finish(EXIT_ERROR)
+            return
+        # 部分项目收集失败时报告仍然输出，但以非零状态退出，便于定时任务发现问题
+        self.finish(EXIT_ERROR if self.errors else EXIT_OK)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    app = QCoreApplication(sys.argv[:1])
+
+    if args.since or args.until:
+        since_date = args.since or args.until
+        until_date = args.until or pendulum.today().date()
+    else:
+        since_date, until_date = get_date_range(args.period)
+    if since_date > until_date:
+        log("起始日期不能晚于结束日期")
+        return EXIT_ERROR
+
+    authors = args.author or load_checked_accounts()
+    if not authors:
+        log("请选择账号！")
+        return EXIT_ERROR
+    project_map = load_project_map(args.project)
+    if args.project:
+        missing = [name for name in args.project if name not in project_map]
+        if missing:
+            log(f"未找到项目：{'、'.join(missing)}")
+    if not project_map:
+        log("请选择项目和分支！")
+        return EXIT_ERROR
+
+    if not args.log_only:
+        settings = [Config().get(f'settings/{key}', '') for key in ('key', 'address', 'model', 'prompt')]
+        if not all(settings):
+            log("请先确认正确的填写了 ai 设置项。")
+            return EXIT_ERROR
+        set_max_connections(Config().get('settings/ai_max_connections', 8))
+        configure_scheduler(
+            Config().get('settings/ai_threads', 4),
+            Config().get('settings/ai_rate_limit', 0),
+            Config().get('settings/ai_max_retries', 3)
+        )
+
+    since, until = git_time_range(since_date, until_date)
+    job = ReportJob(args, project_map, authors, since, until)
+    # Ctrl+C 时停止 git 子进程和 AI 请求；事件循环中定时回到 Python，信号处理函数才能及时执行
+    signal.signal(signal.SIGINT, lambda *_: job.cancel())
+    wake_timer = QTimer()
+    wake_timer.timeout.connect(lambda: None)
+    wake_timer.start(200)
+    QTimer.singleShot(0, job.start)
+    code = app.exec()
+    if args.warm_cache and not job.git_log_manager.wait_for_cache(0):
+        # 报告已经输出；等待后台为首次使用的分支建立提交缓存，下次运行可以直接查询缓存
+        log("正在建立提交缓存，按 Ctrl+C 跳过...")
+        while not job.git_log_manager.wait_for_cache(200):
+            pass
+    else:
+        # 报告输出后立即退出，结束后台建立缓存的 git 进程
+        job.git_log_manager.shutdown()
+    close_clients()
+    return code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,104 @@
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+
+class CommitTableModel(QAbstractTableModel):
+    """
+    提交记录表格模型。
+
+    数据直接引用 Home.grouped_logs 中的 Commit 对象，不复制文本；行按 FETCH_SIZE 分批
+    通过 canFetchMore / fetchMore 暴露给视图，视图只为可见行取数据和绘制。
+    """
+    HEADERS = ["项目", "分支", "账号", "日期", "提交信息"]
+    FETCH_SIZE = 200
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []  # [Commit]
+        self._loaded = 0
+        self._sort_column = -1
+        self._sort_order = Qt.SortOrder.AscendingOrder
+
+    def clear(self):
+        self.beginResetModel()
+        self._rows = []
+        self._loaded = 0
+        self.endResetModel()
+
+    def set_logs(self, grouped_logs):
+        """用完整的分组结果重建模型"""
+        self.beginResetModel()
+        self._rows = [log for logs in grouped_logs.values() for log in logs]
+        self._loaded = 0
+        if self._sort_column >= 0:
+            self._sort_rows()
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
+
+    def append_logs(self, logs):
+        """收集过程中追加一批提交，未加载满一屏时立即显示"""
+        self._rows.extend(logs)
+        if self._loaded < self.FETCH_SIZE:
+            self.fetchMore(QModelIndex())
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= self._loaded:
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._value(self._rows[index.row()], index.column())
+        if role == Qt.ItemDataRole.ToolTipRole and index.column() == 4:
+            return self._value(self._rows[index.row()], index.column())
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return section + 1
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded < len(self._rows)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.FETCH_SIZE, len(self._rows) - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self._sort_column = column
+        self._sort_order = order
+        self.layoutAboutToBeChanged.emit()
+        self._sort_rows()
+        self.layoutChanged.emit()
+
+    def _sort_rows(self):
+        reverse = self._sort_order == Qt.SortOrder.DescendingOrder
+        column = self._sort_column
+        if column == 3:
+            # 日期按时间戳排序，不解析字符串
+            self._rows.sort(key=lambda log: log.timestamp, reverse=reverse)
+        else:
+            self._rows.sort(key=lambda log: self._value(log, column), reverse=reverse)
+
+    @staticmethod
+    def _value(log, column):
+        if column == 0:
+            return log.project
+        if column == 1:
+            return log.branch
+        if column == 2:
+            return log.author
+        if column == 3:
+            return log.date
+        return log.message
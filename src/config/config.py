@@ -1,36 +1,82 @@
 import os
 from contextlib import contextmanager
-from PySide6.QtCore import QSettings, QStandardPaths
-from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QCoreApplication, QSettings, QStandardPaths, QTimer
+
+FLUSH_DELAY_MS = 500  # 修改后延迟写盘的毫秒数，期间的多次修改合并为一次写入
+
+
+def app_data_dir():
+    """应用数据目录（%APPDATA%/work_report），配置文件与各类缓存都放在这里"""
+    base = os.getenv('APPDATA') or QStandardPaths.writableLocation(
+        QStandardPaths.StandardLocation.GenericConfigLocation)
+    path = os.path.join(base, 'work_report')
+    os.makedirs(path, exist_ok=True)
+    return path
+
 
 class Config:
+    """
+    应用配置（config.ini）。
+
+    启动时把全部配置读入内存，读取和 contains 直接查内存；set/remove 只修改内存并记录变更的键，
+    由定时器在 FLUSH_DELAY_MS 后合并写盘，应用退出时（aboutToQuit）再写一次。
+    只在主线程中使用。
+    """
     _instance = None
     _settings = None
     _current_group = ""  # 当前分组路径
 
     def __new__(cls):
         if cls._instance is None:
-            if not QApplication.instance():
-                raise RuntimeError("必须先创建QApplication实例")
+            if not QCoreApplication.instance():
+                raise RuntimeError("必须先创建QCoreApplication实例")
 
             cls._instance = super().__new__(cls)
             cls._instance.init_settings()
         return cls._instance
 
     def init_settings(self):
-        _config_path = os.path.join(os.getenv('APPDATA'), 'work_report', 'config.ini')
-        os.makedirs(os.path.dirname(_config_path), exist_ok=True)
+        _config_path = os.path.join(app_data_dir(), 'config.ini')
         self._settings = QSettings(_config_path, QSettings.Format.IniFormat)
+        self._values = {key: self._settings.value(key) for key in self._settings.allKeys()}
+        self._dirty = set()  # 待写入的键
+        self._removed = set()  # 待删除的键或分组
+        self._flush_timer = QTimer()
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(FLUSH_DELAY_MS)
+        self._flush_timer.timeout.connect(self.flush)
+        QCoreApplication.instance().aboutToQuit.connect(self.flush)
+
+    def _full_key(self, key):
+        return f"{self._current_group}/{key}" if self._current_group else key
 
     def get(self, key, default=None):
         """获取配置值（自动包含当前分组前缀）"""
-        full_key = f"{self._current_group}/{key}" if self._current_group else key
-        return self._settings.value(full_key, default)
+        return self._values.get(self._full_key(key), default)
 
     def set(self, key, value):
         """设置配置值（自动包含当前分组前缀）"""
-        full_key = f"{self._current_group}/{key}" if self._current_group else key
-        self._settings.setValue(full_key, value)
+        full_key = self._full_key(key)
+        self._values[full_key] = value
+        self._dirty.add(full_key)
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush(self):
+        """把内存中的修改写入配置文件"""
+        self._flush_timer.stop()
+        if not self._dirty and not self._removed:
+            return
+        # 先删除再写入：删除分组后又重新设置的键不会丢失
+        for full_key in self._removed:
+            self._settings.remove(full_key)
+        for full_key in self._dirty:
+            self._settings.setValue(full_key, self._values[full_key])
+        self._removed.clear()
+        self._dirty.clear()
         self._settings.sync()
 
     @contextmanager
@@ -59,25 +105,36 @@ class Config:
 
     def contains(self, key):
         """检查键是否存在（考虑当前分组）"""
-        full_key = f"{self._current_group}/{key}" if self._current_group else key
-        return full_key in self._settings.allKeys()
+        return self._full_key(key) in self._values
 
     def remove(self, key):
-        """删除键（考虑当前分组）"""
-        full_key = f"{self._current_group}/{key}" if self._current_group else key
-        self._settings.remove(full_key)
-        self._settings.sync()
+        """删除键（考虑当前分组），与 QSettings 一致，同名分组下的所有键一并删除"""
+        full_key = self._full_key(key)
+        prefix = f"{full_key}/"
+        for k in [k for k in self._values if k == full_key or k.startswith(prefix)]:
+            del self._values[k]
+            self._dirty.discard(k)
+        self._removed.add(full_key)
+        self._schedule_flush()
+
+    def _group_children(self):
+        """当前分组下的直接子键和子分组名称，保持读入及写入的先后顺序"""
+        prefix = f"{self._current_group}/" if self._current_group else ""
+        keys, groups = [], []
+        for k in self._values:
+            if not k.startswith(prefix):
+                continue
+            name, sep, _ = k[len(prefix):].partition('/')
+            if not sep:
+                keys.append(name)
+            elif name not in groups:
+                groups.append(name)
+        return keys, groups
 
     def child_keys(self):
         """获取当前分组下的所有键"""
-        self._settings.beginGroup(self._current_group)
-        keys = self._settings.childKeys()
-        self._settings.endGroup()
-        return keys
+        return self._group_children()[0]
 
     def child_groups(self):
         """获取当前分组下的所有子分组"""
-        self._settings.beginGroup(self._current_group)
-        groups = self._settings.childGroups()
-        self._settings.endGroup()
-        return groups
+        return self._group_children()[1]
@@ -0,0 +1,83 @@
+# 默认提示词：为每位开发者撰写工作总结
+DEFAULT_PROMPT = '''
+你是一位经验丰富的项目经理兼技术文档撰写专家。请根据我提供的 Git 提交记录，为每位开发者撰写简洁、条理清晰的工作总结。总结将用于日常或阶段性工作汇报，请严格按照以下要求生成内容：
+
+提交记录包含以下字段：
+
+提交者
+
+提交时间
+
+项目名称
+
+分支名称
+
+提交信息（commit message）
+
+请按照以下要求进行整理和撰写：
+
+按照开发者对提交记录进行分类，为每位开发者分别撰写工作总结。
+
+合并和归纳提交信息，将内容整理为以下几类工作项：
+功能开发（标注为“功能开发”）
+Bug 修复（标注为“Bug 修复”）
+性能优化或功能改进（标注为“优化改进”）
+文档更新（标注为“文档更新”）
+
+用自然语言撰写总结内容，适当润色技术细节，使其更正式、更适合向团队或管理层汇报。
+
+根据提交时间自动判断汇报周期（日报、周报、月报、季度报或年报），并在总结中体现。
+
+输出为纯文本格式，不使用 Markdown 或特殊符号，保持清晰、简洁、可复制粘贴。
+
+请参照以下格式撰写总结：
+
+开发者：张三
+汇报周期：周报
+参与项目：项目 A、项目 B
+
+本周工作总结：
+
+功能开发：完成了项目 A 的登录功能开发，包含前端表单校验和后端接口联调。
+
+Bug 修复：解决了项目 B 中头像上传失败的问题，修复了文件权限配置。
+
+优化改进：优化了项目 A 的首页加载速度，引入延迟加载机制改善渲染性能。
+
+文档更新：补充了项目 A 接口文档的参数说明与错误码定义。
+
+现在请根据下面的 Git 提交记录，整理并输出符合上述格式的工作总结。
+
+（以下为提交信息）
+'''
+
+# 分段总结（map）提示词：提交记录超过模型上下文时，先对每一段单独提炼要点
+CHUNK_SUMMARY_PROMPT = '''
+你是一位经验丰富的技术文档撰写专家。下面是一位开发者在某个项目中的一段 Git 提交记录，
+提交记录较多，会被拆分成多段分别处理，最终再由另一位助手汇总成正式的工作总结。
+
+请提炼这一段提交记录的工作要点：
+
+按“功能开发”“Bug 修复”“优化改进”“文档更新”分类列出，每类若干条，没有的类别省略。
+
+合并含义相同或相近的提交，保留开发者、项目名称、分支名称和提交时间范围等关键信息。
+
+输出为纯文本格式，不使用 Markdown 或特殊符号，不要寒暄和额外解释。
+'''
+
+# 分层合并提示词：各段要点合计仍超过模型上下文时，先把相邻的若干段合并为更精简的要点，再进行汇总
+SUMMARY_MERGE_PROMPT = '''
+你是一位经验丰富的技术文档撰写专家。下面是从 Git 提交记录中分段提炼出的多段工作要点，
+内容较多，需要先合并压缩，最终再由另一位助手汇总成正式的工作总结。
+
+请把这些要点合并为一份更精简的要点：
+
+按开发者分组，每位开发者下注明参与的项目，再按“功能开发”“Bug 修复”“优化改进”“文档更新”分类列出，没有的类别省略。
+
+合并含义相同或相近的条目，保留开发者、项目名称和时间范围等关键信息，不要遗漏任何开发者。
+
+输出为纯文本格式，不使用 Markdown 或特殊符号，不要寒暄和额外解释。
+'''
+
+# 汇总（reduce）时附加在摘要前的说明
+CHUNK_SUMMARY_HEADER = "（提交记录较多，以下为按开发者和项目分段提炼的提交摘要）"
@@ -0,0 +1,212 @@
+import json
+import os
+import sqlite3
+
+from src.config.config import Config, app_data_dir
+
+
+class Project:
+    """已导入的项目：路径、展开状态、上次读取到的本地分支和勾选的分支（如 local/main）"""
+    __slots__ = ('name', 'path', 'expanded', 'branches', 'checked')
+
+    def __init__(self, name, path, expanded=True, branches=None, checked=None):
+        self.name = name
+        self.path = path
+        self.expanded = expanded
+        self.branches = branches or []
+        self.checked = checked or set()
+
+
+class Account:
+    __slots__ = ('name', 'email', 'checked')
+
+    def __init__(self, name, email, checked=False):
+        self.name = name
+        self.email = email
+        self.checked = checked
+
+
+class Workspace:
+    """
+    项目、分支、勾选状态和账号的持久化存储（配置目录下的 workspace.db）。
+
+    每种数据一张表，界面操作只更新受影响的行，例如展开项目只修改一列、勾选分支只增删一行，
+    不再整体读写 JSON。首次打开时从 config.ini 的 projects、accounts 分组一次性迁移。
+    与 Config 一样是单例，只在主线程中使用。
+    """
+    SCHEMA_VERSION = 1
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.init_db()
+        return cls._instance
+
+    def init_db(self):
+        self.db_path = os.path.join(app_data_dir(), 'workspace.db')
+        self._conn = sqlite3.connect(self.db_path, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        version = self._conn.execute('PRAGMA user_version').fetchone()[0]
+        if version < self.SCHEMA_VERSION:
+            self._init_schema()
+
+    def _init_schema(self):
+        with self._conn:
+            self._conn.executescript('''
+                CREATE TABLE IF NOT EXISTS projects (
+                    name TEXT PRIMARY KEY,
+                    path TEXT NOT NULL,
+                    expanded INTEGER NOT NULL DEFAULT 1,
+                    position INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS branches (
+                    project TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    PRIMARY KEY (project, name)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS checked_branches (
+                    project TEXT NOT NULL,
+                    ref TEXT NOT NULL,
+                    PRIMARY KEY (project, ref)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS accounts (
+                    name TEXT PRIMARY KEY,
+                    email TEXT NOT NULL,
+                    checked INTEGER NOT NULL DEFAULT 0,
+                    position INTEGER NOT NULL
+                );
+            ''')
+            self._migrate_from_config()
+            self._conn.execute(f'PRAGMA user_version = {self.SCHEMA_VERSION}')
+        # 导入成功后再从配置文件中删除
+        Config().remove('projects')
+        Config().remove('accounts')
+
+    def _migrate_from_config(self):
+        """把 config.ini 中以 JSON 保存的项目和账号导入数据库"""
+        config = Config()
+        with config.group('projects'):
+            for position, name in enumerate(config.child_keys()):
+                try:
+                    data = json.loads(config.get(name, '') or '{}')
+                except json.JSONDecodeError:
+                    print(f"迁移项目失败 [{name}]：配置格式错误")
+                    continue
+                if not data.get('path'):
+                    continue
+                self._conn.execute('INSERT OR REPLACE INTO projects VALUES (?, ?, ?, ?)',
+                                   (name, data['path'], int(data.get('expanded', True)), position))
+                self._conn.executemany('INSERT OR IGNORE INTO branches VALUES (?, ?, ?)',
+                                       [(name, branch, i) for i, branch in enumerate(data.get('branches', []))])
+                self._conn.executemany('INSERT OR IGNORE INTO checked_branches VALUES (?, ?)',
+                                       [(name, ref) for ref in data.get('checked', [])])
+
+        with config.group('accounts'):
+            try:
+                accounts = json.loads(config.get('account_list', '') or '{}')
+            except json.JSONDecodeError:
+                print("迁移账号失败：配置格式错误")
+                accounts = {}
+        self._conn.executemany('INSERT OR REPLACE INTO accounts VALUES (?, ?, ?, ?)', [
+            (name, data.get('email', ''), int(data.get('checked', False)), position)
+            for position, (name, data) in enumerate(accounts.items())
+        ])
+
+    def _next_position(self, table):
+        return self._conn.execute(f'SELECT COALESCE(MAX(position), -1) + 1 FROM {table}').fetchone()[0]
+
+    # 项目
+
+    def projects(self):
+        """按导入顺序返回所有项目"""
+        branches = {}
+        for project, name in self._conn.execute('SELECT project, name FROM branches ORDER BY project, position'):
+            branches.setdefault(project, []).append(name)
+        checked = {}
+        for project, ref in self._conn.execute('SELECT project, ref FROM checked_branches'):
+            checked.setdefault(project, set()).add(ref)
+        return [
+            Project(name, path, bool(expanded), branches.get(name), checked.get(name))
+            for name, path, expanded in self._conn.execute(
+                'SELECT name, path, expanded FROM projects ORDER BY position')
+        ]
+
+    def project(self, name):
+        row = self._conn.execute('SELECT path, expanded FROM projects WHERE name = ?', (name,)).fetchone()
+        if row is None:
+            return None
+        branches = [branch for branch, in self._conn.execute(
+            'SELECT name FROM branches WHERE project = ? ORDER BY position', (name,))]
+        checked = {ref for ref, in self._conn.execute(
+            'SELECT ref FROM checked_branches WHERE project = ?', (name,))}
+        return Project(name, row[0], bool(row[1]), branches, checked)
+
+    def add_project(self, name, path):
+        """添加项目；同名项目已存在时更新路径，并清空其分支和勾选状态"""
+        self.add_projects([(name, path)])
+
+    def add_projects(self, projects, expanded=True):
+        """在一个事务中批量添加 [(name, path)]，规则与 add_project 相同"""
+        with self._conn:
+            position = self._next_position('projects')
+            for name, path in projects:
+                self._conn.execute('''
+                    INSERT INTO projects VALUES (?, ?, ?, ?)
+                    ON CONFLICT (name) DO UPDATE SET path = excluded.path, expanded = excluded.expanded
+                ''', (name, path, int(expanded), position))
+                self._conn.execute('DELETE FROM branches WHERE project = ?', (name,))
+                self._conn.execute('DELETE FROM checked_branches WHERE project = ?', (name,))
+                position += 1
+
+    def remove_project(self, name):
+        with self._conn:
+            self._conn.execute('DELETE FROM projects WHERE name = ?', (name,))
+            self._conn.execute('DELETE FROM branches WHERE project = ?', (name,))
+            self._conn.execute('DELETE FROM checked_branches WHERE project = ?', (name,))
+
+    def set_expanded(self, name, expanded):
+        with self._conn:
+            self._conn.execute('UPDATE projects SET expanded = ? WHERE name = ?', (int(expanded), name))
+
+    def set_branches(self, name, branches):
+        """保存读取到的分支列表，下次启动时直接显示；勾选状态单独保存，不受影响"""
+        with self._conn:
+            self._conn.execute('DELETE FROM branches WHERE project = ?', (name,))
+            self._conn.executemany('INSERT OR IGNORE INTO branches VALUES (?, ?, ?)',
+                                   [(name, branch, i) for i, branch in enumerate(branches)])
+
+    def set_branch_checked(self, name, ref, checked):
+        with self._conn:
+            if checked:
+                self._conn.execute('INSERT OR IGNORE INTO checked_branches VALUES (?, ?)', (name, ref))
+            else:
+                self._conn.execute('DELETE FROM checked_branches WHERE project = ? AND ref = ?', (name, ref))
+
+    # 账号
+
+    def accounts(self):
+        """按添加顺序返回所有账号"""
+        return [
+            Account(name, email, bool(checked))
+            for name, email, checked in self._conn.execute(
+                'SELECT name, email, checked FROM accounts ORDER BY position')
+        ]
+
+    def add_account(self, name, email):
+        """添加账号（默认不勾选）；同名账号已存在时更新邮箱"""
+        with self._conn:
+            self._conn.execute('''
+                INSERT INTO accounts VALUES (?, ?, 0, ?)
+                ON CONFLICT (name) DO UPDATE SET email = excluded.email, checked = 0
+            ''', (name, email, self._next_position('accounts')))
+
+    def remove_account(self, name):
+        with self._conn:
+            self._conn.execute('DELETE FROM accounts WHERE name = ?', (name,))
+
+    def set_account_checked(self, name, checked):
+        with self._conn:
+            self._conn.execute('UPDATE accounts SET checked = ? WHERE name = ?', (int(checked), name))
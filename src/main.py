@@ -5,6 +5,9 @@ import qtmodern6.styles
 from PySide6.QtGui import QIcon
 from PySide6 import QtWidgets
 from src.views.home.home import Home
+from src.config.config import Config
+from src.utils.ai_client import close_clients, set_max_connections
+from src.utils.ai_scheduler import configure_scheduler
 
 def resource_path(relative_path):
     if hasattr(sys, '_MEIPASS'):
@@ -14,6 +17,13 @@ def resource_path(relative_path):
 if __name__ == "__main__":
     app = QtWidgets.QApplication(sys.argv)
     qtmodern6.styles.dark(app)
+    set_max_connections(Config().get('settings/ai_max_connections', 8))
+    configure_scheduler(
+        Config().get('settings/ai_threads', 4),
+        Config().get('settings/ai_rate_limit', 0),
+        Config().get('settings/ai_max_retries', 3)
+    )
+    app.aboutToQuit.connect(close_clients)
     home = Home()
     mw = qtmodern6.windows.ModernWindow(home)
     icon_path = resource_path("src/resources/app.ico")
@@ -0,0 +1,60 @@
+import threading
+
+import httpx
+from openai import OpenAI, DefaultHttpxClient
+
+DEFAULT_MAX_CONNECTIONS = 8
+KEEPALIVE_EXPIRY = 60  # 空闲连接保留的秒数
+
+_lock = threading.Lock()
+_clients = {}  # (base_url, api_key) -> OpenAI
+_retired = []  # 修改连接数后替换下来的客户端，可能仍有请求在使用，退出时再关闭
+_max_connections = DEFAULT_MAX_CONNECTIONS
+
+
+def get_client(api_key, base_url):
+    """
+    获取 (base_url, api_key) 对应的共享 OpenAI 客户端。
+
+    同一个客户端在各个 AI 任务线程间复用，底层 httpx 连接池保持长连接，
+    分段总结、按开发者并行生成时不必为每个请求重新建立 TCP/TLS 连接。
+    """
+    key = (base_url, api_key)
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            limits = httpx.Limits(
+                max_connections=_max_connections,
+                max_keepalive_connections=_max_connections,
+                keepalive_expiry=KEEPALIVE_EXPIRY
+            )
+            # 重试交给 AIScheduler 统一处理，客户端自身不再重试
+            client = OpenAI(api_key=api_key, base_url=base_url, max_retries=0,
+                            http_client=DefaultHttpxClient(limits=limits))
+            _clients[key] = client
+        return client
+
+
+def set_max_connections(max_connections):
+    """修改每个客户端的最大连接数，之后新建的客户端生效"""
+    global _max_connections
+    max_connections = max(1, int(max_connections))
+    with _lock:
+        if max_connections == _max_connections:
+            return
+        _max_connections = max_connections
+        _retired.extend(_clients.values())
+        _clients.clear()
+
+
+def close_clients():
+    """关闭所有客户端及其连接池，在应用退出时调用"""
+    with _lock:
+        clients = list(_clients.values()) + _retired
+        _clients.clear()
+        _retired.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception:
+            pass
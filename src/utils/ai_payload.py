@@ -0,0 +1,172 @@
+import re
+import time
+
+
+def estimate_tokens(text):
+    """
+    粗略估算文本的 token 数：中日韩文字约 1 个字 1 个 token，其余字符约 4 个 1 个 token。
+    """
+    cjk = sum(1 for ch in text if '\u3000' <= ch <= '\u9fff' or '\uff00' <= ch <= '\uffef')
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def format_commit_log(grouped_logs, author=None):
+    """
+    把分组后的提交记录整理为纯文本，用于文本视图和 AI 总结；指定 author 时只输出该账号的记录。
+    """
+    # 同一项目内的提交已由 git 去重（每个提交只归属一个分支），这里按组依次输出
+    lines = []
+    for (project, branch, log_author), logs in grouped_logs.items():
+        if author is not None and log_author != author:
+            continue
+        lines.append(f"【项目】{project}\n【分支】{branch}\n【账号】{log_author}")
+        lines.extend(f"{log.date} {log.message}" for log in logs)
+        lines.append("")
+    return "\n".join(lines)
+
+
+def group_logs_by_author_project(grouped_logs):
+    """把 {(project, branch, author): logs} 重新按 (author, project) 归类，保持原有顺序"""
+    result = {}
+    for (project, branch, author), logs in grouped_logs.items():
+        if logs:
+            result.setdefault((author, project), []).append((branch, logs))
+    return result
+
+
+MERGE_PREFIXES = ('Merge branch', 'Merge remote-tracking branch', 'Merge pull request', 'Merge tag',
+                  'Merge commit', 'Merge request', '合并分支')
+REVERT_PATTERN = re.compile(r'^Revert "(.+)"$')
+
+
+def _subject(message):
+    return message.strip().split('\n', 1)[0].strip()
+
+
+def _message_key(subject):
+    """近似重复判断：忽略大小写、空白、标点和 #123 这类编号"""
+    subject = re.sub(r'\(?#\d+\)?', '', subject.lower())
+    return re.sub(r'[\W_]+', '', subject)
+
+
+def _compact_message(message):
+    """多行提交信息压成一行"""
+    lines = [line.strip() for line in message.strip().split('\n')]
+    return '；'.join(line for line in lines if line)
+
+
+def _date_format(logs):
+    """
+    按提交记录覆盖的时间范围决定日期精度：同一天不写日期，同一年只写月-日。
+    只根据传入的这部分记录计算，其他开发者、项目的提交变化不会改变这一段的内容（及其缓存键）。
+    """
+    days = set()
+    for log in logs:
+        t = time.gmtime(log.timestamp + log.tz_offset * 60)
+        days.add((t.tm_year, t.tm_mon, t.tm_mday))
+    if len(days) <= 1:
+        return None
+    if len({day[0] for day in days}) == 1:
+        return '{1:02d}-{2:02d}'
+    return '{0:04d}-{1:02d}-{2:02d}'
+
+
+def compact_branch_lines(branches, date_format):
+    """
+    把一个开发者在一个项目中的提交整理为精简的行。
+
+    branches: [(branch, [Commit])]
+    每个分支一行标题，其下按日期合并为“日期 信息1；信息2”；合并提交、回滚提交以及被回滚的原提交
+    直接去掉，近似重复的信息只保留第一次出现并标注次数。
+    """
+    reverted = set()
+    for log in (log for _, branch_logs in branches for log in branch_logs):
+        match = REVERT_PATTERN.match(_subject(log.message))
+        if match:
+            reverted.add(_message_key(match.group(1)))
+
+    counts = {}
+    kept = {}  # branch -> {day: [(timestamp, Commit, key)]}
+    for branch, branch_logs in branches:
+        for log in branch_logs:
+            subject = _subject(log.message)
+            key = _message_key(subject)
+            if not key or subject.startswith(MERGE_PREFIXES) or REVERT_PATTERN.match(subject) or key in reverted:
+                continue
+            counts[key] = counts.get(key, 0) + 1
+            if counts[key] > 1:
+                continue
+            day = ''
+            if date_format:
+                t = time.gmtime(log.timestamp + log.tz_offset * 60)
+                day = date_format.format(t.tm_year, t.tm_mon, t.tm_mday)
+            kept.setdefault(branch, {}).setdefault(day, []).append((log.timestamp, log, key))
+
+    lines = []
+    for branch, days in kept.items():
+        lines.append(f"【分支】{branch}")
+        for day, items in sorted(days.items(), key=lambda item: min(ts for ts, _, _ in item[1])):
+            messages = []
+            for _, log, key in sorted(items, key=lambda item: item[0]):
+                message = _compact_message(log.message)
+                messages.append(f"{message}（×{counts[key]}）" if counts[key] > 1 else message)
+            lines.append(f"{day} {'；'.join(messages)}" if day else '；'.join(messages))
+    return lines
+
+
+def build_compact_payload(grouped_logs, author=None):
+    """
+    生成发送给模型的精简提交记录，指定 author 时只包含该账号。
+
+    按 账号 → 项目 → 分支 分层，每个标题只出现一次；日期精度、去重、过滤规则见 compact_branch_lines。
+    """
+    date_format = _date_format(
+        log for (_, _, log_author), logs in grouped_logs.items()
+        if author is None or log_author == author
+        for log in logs
+    )
+    sections = []
+    current_author = None
+    for (log_author, project), branches in group_logs_by_author_project(grouped_logs).items():
+        if author is not None and log_author != author:
+            continue
+        lines = compact_branch_lines(branches, date_format)
+        if not lines:
+            continue
+        if log_author != current_author:
+            sections.append(f"【账号】{log_author}")
+            current_author = log_author
+        sections.append(f"【项目】{project}")
+        sections.extend(lines)
+    return "\n".join(sections)
+
+
+def split_logs_into_chunks(grouped_logs, max_tokens):
+    """
+    按开发者、项目把精简后的提交记录切分为不超过 max_tokens 的文本段。
+
+    每段都带有开发者、项目、分支标题，单个开发者在单个项目中的记录过多时拆成多段。
+    日期精度按每个开发者在每个项目中的记录单独决定。返回 [(author, project, text)]。
+    """
+    chunks = []
+    for (author, project), branches in group_logs_by_author_project(grouped_logs).items():
+        date_format = _date_format(log for _, logs in branches for log in logs)
+        header = f"【账号】{author}\n【项目】{project}"
+        lines = [header]
+        tokens = estimate_tokens(header)
+        branch_line = None
+        for line in compact_branch_lines(branches, date_format):
+            line_tokens = estimate_tokens(line)
+            if line.startswith("【分支】"):
+                branch_line = line
+            elif tokens + line_tokens > max_tokens and len(lines) > 2:
+                if lines[-1] == branch_line:
+                    lines.pop()
+                chunks.append((author, project, "\n".join(lines)))
+                lines = [header, branch_line]
+                tokens = estimate_tokens(header) + estimate_tokens(branch_line)
+            lines.append(line)
+            tokens += line_tokens
+        if len(lines) > 1:
+            chunks.append((author, project, "\n".join(lines)))
+    return chunks
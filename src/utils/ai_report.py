@@ -0,0 +1,364 @@
+from PySide6.QtCore import QObject, Signal, QThreadPool
+
+from src.config.prompts import CHUNK_SUMMARY_PROMPT, CHUNK_SUMMARY_HEADER, SUMMARY_MERGE_PROMPT
+from src.utils.ai_payload import build_compact_payload, estimate_tokens, split_logs_into_chunks
+from src.utils.ai_task import AITask
+from src.utils.cancellation import CancellationToken
+from src.utils.summary_cache import summary_key
+
+
+def order_authors(grouped_logs, preferred):
+    """
+    已收集记录中的开发者排序：先按 preferred（账号列表）的顺序，其余开发者按收集顺序排在最后
+    """
+    collected = list(dict.fromkeys(author for _, _, author in grouped_logs))
+    authors = [author for author in preferred if author in collected]
+    return authors + [author for author in collected if author not in authors]
+
+
+def choose_report_mode(report_mode, author_count, tokens, max_context_tokens):
+    """
+    选择报告的生成方式：
+    per_author：设置为按开发者生成且有多个开发者（单个开发者超过模型上下文时由 PerAuthorReportManager 分段总结）；
+    map_reduce：提交记录超过模型上下文，分段总结再汇总；
+    single：整体一次生成。
+    """
+    if report_mode == 'per_author' and author_count > 1:
+        return 'per_author'
+    if tokens > max_context_tokens:
+        return 'map_reduce'
+    return 'single'
+
+
+class MapReduceReportManager(QObject):
+    """
+    提交记录超过模型上下文时使用的分段总结流程。
+
+    map：按开发者、项目把 grouped_logs 切成不超过 max_chunk_tokens 的段，在线程池中并行提炼要点；
+    reduce：把所有要点按原有顺序拼接，使用报告提示词（默认提示词格式）生成最终报告，结果流式输出。
+    拼接后仍超过 max_context_tokens 时逐层合并：把相邻的要点分组压缩为更精简的要点，直到可以一次汇总。
+    传入 summary_cache 时，各段要点和最终报告都会先查缓存，只有内容变化的段重新请求。
+    cancel 后关闭所有请求，之后到达的结果全部丢弃。
+    """
+    progress = Signal(int, int)  # done, total（map 阶段）
+    chunk = Signal(str)  # reduce 阶段的流式内容
+    success = Signal(str)
+    error = Signal(str)
+
+    def __init__(self, api_key, base_url, model, prompt, max_chunk_tokens=6000, max_threads=4,
+                 summary_cache=None, max_context_tokens=None):
+        super().__init__()
+        self.api_key = api_key
+        self.base_url = base_url
+        self.model = model
+        self.prompt = prompt
+        self.max_chunk_tokens = max_chunk_tokens
+        self.max_context_tokens = max_context_tokens or max_chunk_tokens * 4
+        self.summary_cache = summary_cache
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(max(1, max_threads))
+        self.chunks = []
+        self.summaries = []
+        self.merge_groups = []  # 当前合并层的输入
+        self.merged = []
+        self.merge_done = 0
+        self.tasks = []  # 持有任务引用，避免任务及其信号对象在执行完之前被回收
+        self.done = 0
+        self.failed = False
+        self.token = CancellationToken()
+
+    def cancel(self):
+        self.token.cancel()
+        self.thread_pool.clear()
+
+    def start(self, grouped_logs):
+        self.token = CancellationToken()
+        self.chunks = split_logs_into_chunks(grouped_logs, self.max_chunk_tokens)
+        self.summaries = [None] * len(self.chunks)
+        self.tasks = []
+        self.done = 0
+        self.failed = False
+        if not self.chunks:
+            self.error.emit("没有可总结的提交记录！")
+            return
+
+        pending = []
+        for index, (_, _, text) in enumerate(self.chunks):
+            cached = self._cache_get(CHUNK_SUMMARY_PROMPT, text)
+            if cached is None:
+                pending.append(index)
+            else:
+                self.summaries[index] = cached
+                self.done += 1
+
+        self.progress.emit(self.done, len(self.chunks))
+        if not pending:
+            self._reduce()
+            return
+        for index in pending:
+            task = AITask(self.api_key, self.base_url, self.model, CHUNK_SUMMARY_PROMPT, self.chunks[index][2],
+                          token=self.token)
+            task.signals.success.connect(lambda reply, i=index: self._on_chunk_success(i, reply))
+            task.signals.error.connect(self._on_chunk_error)
+            self.tasks.append(task)
+            self.thread_pool.start(task)
+
+    def _cache_get(self, prompt, payload):
+        if self.summary_cache is None:
+            return None
+        return self.summary_cache.get(summary_key(self.model, prompt, payload))
+
+    def _cache_put(self, prompt, payload, reply):
+        if self.summary_cache is not None:
+            self.summary_cache.put(summary_key(self.model, prompt, payload), reply)
+
+    def _on_chunk_success(self, index, reply):
+        if self.failed or self.token.is_cancelled():
+            return
+        self.summaries[index] = reply.strip()
+        self._cache_put(CHUNK_SUMMARY_PROMPT, self.chunks[index][2], self.summaries[index])
+        self.done += 1
+        self.progress.emit(self.done, len(self.chunks))
+        if self.done == len(self.chunks):
+            self._reduce()
+
+    def _on_chunk_error(self, message):
+        if self.failed or self.token.is_cancelled():
+            return
+        # 任意一段失败即终止，避免生成缺失内容的报告
+        self.failed = True
+        self.thread_pool.clear()
+        self.error.emit(f"分段总结失败：{message}")
+
+    def _reduce(self):
+        self._reduce_sections([
+            f"【开发者】{author}\n【项目】{project}\n{summary}"
+            for (author, project, _), summary in zip(self.chunks, self.summaries)
+        ])
+
+    def _reduce_sections(self, sections):
+        payload = "\n\n".join([CHUNK_SUMMARY_HEADER, *sections])
+        if len(sections) > 1 and estimate_tokens(self.prompt) + estimate_tokens(payload) > self.max_context_tokens:
+            self._merge(sections)
+            return
+        cached = self._cache_get(self.prompt, payload)
+        if cached is not None:
+            self.success.emit(cached)
+            return
+        task = AITask(self.api_key, self.base_url, self.model, self.prompt, payload, stream=True, token=self.token)
+        task.signals.chunk.connect(self._on_reduce_chunk)
+        task.signals.success.connect(lambda reply: self._on_reduce_success(payload, reply))
+        task.signals.error.connect(self._on_reduce_error)
+        self.tasks.append(task)
+        self.thread_pool.start(task)
+
+    def _group_sections(self, sections):
+        """
+        把相邻的要点分组，每组不超过上下文的一半（留出输出的空间）。
+        每组至少两段，保证每合并一层段数至少减半，最终一定可以一次汇总。
+        """
+        budget = self.max_context_tokens // 2
+        groups = []
+        current = []
+        tokens = 0
+        for section in sections:
+            section_tokens = estimate_tokens(section)
+            if len(current) >= 2 and tokens + section_tokens > budget:
+                groups.append(current)
+                current = []
+                tokens = 0
+            current.append(section)
+            tokens += section_tokens
+        if len(current) == 1 and groups:
+            groups[-1].extend(current)
+        elif current:
+            groups.append(current)
+        return ["\n\n".join(group) for group in groups]
+
+    def _merge(self, sections):
+        self.merge_groups = self._group_sections(sections)
+        self.merged = [None] * len(self.merge_groups)
+        self.merge_done = 0
+        pending = []
+        for index, text in enumerate(self.merge_groups):
+            cached = self._cache_get(SUMMARY_MERGE_PROMPT, text)
+            if cached is None:
+                pending.append(index)
+            else:
+                self.merged[index] = cached
+                self.merge_done += 1
+
+        self.progress.emit(self.merge_done, len(self.merge_groups))
+        if not pending:
+            self._reduce_sections(self.merged)
+            return
+        for index in pending:
+            task = AITask(self.api_key, self.base_url, self.model, SUMMARY_MERGE_PROMPT, self.merge_groups[index],
+                          token=self.token)
+            task.signals.success.connect(lambda reply, i=index: self._on_merge_success(i, reply))
+            task.signals.error.connect(self._on_chunk_error)
+            self.tasks.append(task)
+            self.thread_pool.start(task)
+
+    def _on_merge_success(self, index, reply):
+        if self.failed or self.token.is_cancelled():
+            return
+        self.merged[index] = reply.strip()
+        self._cache_put(SUMMARY_MERGE_PROMPT, self.merge_groups[index], self.merged[index])
+        self.merge_done += 1
+        self.progress.emit(self.merge_done, len(self.merge_groups))
+        if self.merge_done == len(self.merge_groups):
+            self._reduce_sections(self.merged)
+
+    def _on_reduce_chunk(self, text):
+        if not self.token.is_cancelled():
+            self.chunk.emit(text)
+
+    def _on_reduce_success(self, payload, reply):
+        if self.token.is_cancelled():
+            return
+        self._cache_put(self.prompt, payload, reply)
+        self.success.emit(reply)
+
+    def _on_reduce_error(self, message):
+        if not self.token.is_cancelled():
+            self.error.emit(message)
+
+
+class PerAuthorReportManager(QObject):
+    """
+    按开发者并行生成报告。
+
+    每个有提交记录的开发者发起一个 AITask，同时进行的请求数由线程池限制；每完成一个开发者
+    汇报一次进度，并按传入的开发者顺序拼接当前结果，最终报告的顺序与请求完成的先后无关。
+    单个开发者失败时在其位置写明原因，其余开发者照常生成；全部失败才发出 error。
+    传入 max_context_tokens 时，提交记录超过模型上下文的开发者改用 MapReduceReportManager 分段总结。
+    传入 summary_cache 时按开发者分段缓存，只有提交记录变化的开发者会重新请求。
+    cancel 后关闭所有请求，之后到达的结果全部丢弃。
+    """
+    progress = Signal(int, int)  # done, total
+    partial = Signal(str)  # 按顺序拼接的当前结果，未完成的开发者显示占位
+    success = Signal(str)
+    error = Signal(str)
+
+    PENDING_TEXT = "生成中..."
+
+    def __init__(self, api_key, base_url, model, prompt, max_threads=4, summary_cache=None,
+                 max_context_tokens=None):
+        super().__init__()
+        self.api_key = api_key
+        self.base_url = base_url
+        self.model = model
+        self.prompt = prompt
+        self.max_threads = max_threads
+        self.summary_cache = summary_cache
+        self.max_context_tokens = max_context_tokens
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(max(1, max_threads))
+        self.authors = []
+        self.reports = {}
+        self.failed_authors = []
+        self.tasks = []  # 持有任务引用，避免任务及其信号对象在执行完之前被回收
+        self.managers = []  # 超过上下文的开发者使用的分段总结
+        self.done = 0
+        self.token = CancellationToken()
+
+    def cancel(self):
+        self.token.cancel()
+        self.thread_pool.clear()
+        for manager in self.managers:
+            manager.cancel()
+
+    def start(self, grouped_logs, authors):
+        """
+        grouped_logs: {(project, branch, author): [Commit]}
+        authors: 开发者列表，决定最终报告中各开发者的先后顺序
+        """
+        self.token = CancellationToken()
+        with_logs = {author for (_, _, author), logs in grouped_logs.items() if logs}
+        self.authors = [author for author in authors if author in with_logs]
+        self.reports = {}
+        self.failed_authors = []
+        self.tasks = []
+        self.managers = []
+        self.done = 0
+        if not self.authors:
+            self.error.emit("没有可总结的提交记录！")
+            return
+
+        pending = []
+        oversized = []
+        prompt_tokens = estimate_tokens(self.prompt)
+        for author in self.authors:
+            payload = build_compact_payload(grouped_logs, author)
+            if self.max_context_tokens and prompt_tokens + estimate_tokens(payload) > self.max_context_tokens:
+                oversized.append(author)
+                continue
+            key = summary_key(self.model, self.prompt, payload)
+            cached = self.summary_cache.get(key) if self.summary_cache is not None else None
+            if cached is None:
+                pending.append((author, payload, key))
+            else:
+                self.reports[author] = cached
+                self.done += 1
+
+        self.progress.emit(self.done, len(self.authors))
+        if not pending and not oversized:
+            self.success.emit(self.assemble())
+            return
+        if self.done:
+            self.partial.emit(self.assemble())
+        for author, payload, key in pending:
+            task = AITask(self.api_key, self.base_url, self.model, self.prompt, payload, token=self.token)
+            task.signals.success.connect(lambda reply, a=author, k=key: self._on_author_success(a, k, reply.strip()))
+            task.signals.error.connect(lambda message, a=author: self._on_author_error(a, message))
+            self.tasks.append(task)
+            self.thread_pool.start(task)
+        for author in oversized:
+            # 分段要点和最终报告由 MapReduceReportManager 自行缓存
+            manager = MapReduceReportManager(self.api_key, self.base_url, self.model, self.prompt,
+                                             max_chunk_tokens=self.max_context_tokens // 4,
+                                             max_threads=self.max_threads, summary_cache=self.summary_cache,
+                                             max_context_tokens=self.max_context_tokens)
+            manager.success.connect(lambda reply, a=author: self._on_author_success(a, None, reply.strip()))
+            manager.error.connect(lambda message, a=author: self._on_author_error(a, message))
+            self.managers.append(manager)
+            manager.start({key: logs for key, logs in grouped_logs.items() if key[2] == author})
+
+    def assemble(self):
+        """
+        按开发者顺序拼接报告。提示词要求模型以“开发者：姓名”开头，生成的报告不再额外加标题，
+        只有生成中和失败的开发者补上姓名。
+        """
+        sections = []
+        for author in self.authors:
+            if author in self.reports and author not in self.failed_authors:
+                sections.append(self.reports[author])
+            else:
+                sections.append(f"开发者：{author}\n{self.reports.get(author, self.PENDING_TEXT)}")
+        return "\n\n".join(sections)
+
+    def _on_author_success(self, author, key, report):
+        if self.token.is_cancelled():
+            return
+        if self.summary_cache is not None and key is not None:
+            self.summary_cache.put(key, report)
+        self._on_author_finished(author, report)
+
+    def _on_author_error(self, author, message):
+        if self.token.is_cancelled():
+            return
+        self.failed_authors.append(author)
+        self._on_author_finished(author, f"（生成失败：{message}）")
+
+    def _on_author_finished(self, author, report):
+        self.reports[author] = report
+        self.done += 1
+        self.progress.emit(self.done, len(self.authors))
+        if self.done < len(self.authors):
+            self.partial.emit(self.assemble())
+            return
+        if len(self.failed_authors) == len(self.authors):
+            self.error.emit(f"所有开发者的报告均生成失败：\n{self.reports[self.authors[0]]}")
+        else:
+            self.success.emit(self.assemble())
@@ -0,0 +1,140 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import openai
+
+from src.utils.cancellation import CancelledError
+
+DEFAULT_MAX_RETRIES = 3
+BASE_DELAY = 1.0  # 首次重试的基础等待秒数，之后每次翻倍
+MAX_DELAY = 60.0
+
+
+class TokenBucket:
+    """
+    令牌桶限流：每分钟补充 rate_per_minute 个令牌，最多累积 burst 个，取不到令牌时阻塞等待。
+    rate_per_minute 为 0 时不限流。
+    """
+
+    def __init__(self, rate_per_minute, burst=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, burst or rate_per_minute // 6 or 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, token=None):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            if token is None:
+                time.sleep(wait)
+            elif token.wait(wait):
+                raise CancelledError()
+
+
+def is_retryable(error):
+    """超时、连接失败、429 和 5xx 可以重试，其余错误（如密钥无效、参数错误）直接失败"""
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+def retry_after_seconds(error):
+    """读取响应头中的 Retry-After（秒数或 HTTP 日期），没有时返回 None"""
+    response = getattr(error, 'response', None)
+    if response is None:
+        return None
+    headers = response.headers
+    value = headers.get('retry-after-ms')
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get('retry-after')
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AIScheduler:
+    """
+    AI 请求调度：限制同时进行的请求数，按令牌桶限流，可重试的错误按指数退避加随机抖动重试，
+    服务端给出 Retry-After 时按其等待。退避等待期间不占用并发名额。
+    """
+
+    def __init__(self, max_concurrency=4, rate_per_minute=0, max_retries=DEFAULT_MAX_RETRIES):
+        self.max_retries = max(0, max_retries)
+        self.bucket = TokenBucket(rate_per_minute)
+        self._semaphore = threading.BoundedSemaphore(max(1, max_concurrency))
+
+    def run(self, request, can_retry=None, token=None):
+        """
+        执行 request()，返回其结果；重试用尽或遇到不可重试的错误时抛出最后一次的异常。
+        can_retry: 可选，返回 False 时不再重试（例如流式输出已经发出了部分内容）。
+        token: 可选的 CancellationToken，取消后不再发起请求，退避等待也会立即结束。
+        """
+        attempt = 0
+        while True:
+            with self._semaphore:
+                self.bucket.acquire(token)
+                if token is not None:
+                    token.raise_if_cancelled()
+                try:
+                    return request()
+                except Exception as e:
+                    if token is not None:
+                        token.raise_if_cancelled()
+                    if attempt >= self.max_retries or not is_retryable(e) or (can_retry and not can_retry()):
+                        raise
+                    delay = self.retry_delay(attempt, e)
+                    reason = type(e).__name__
+            print(f"AI 请求失败，{delay:.1f} 秒后第 {attempt + 1} 次重试：{reason}")
+            if token is not None:
+                if token.wait(delay):
+                    raise CancelledError()
+            else:
+                time.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def retry_delay(attempt, error=None):
+        retry_after = retry_after_seconds(error) if error is not None else None
+        if retry_after is not None:
+            return min(MAX_DELAY, retry_after)
+        # 指数退避 + 抖动，避免并行请求在同一时刻集中重试
+        backoff = min(MAX_DELAY, BASE_DELAY * 2 ** attempt)
+        return random.uniform(backoff / 2, backoff)
+
+
+_scheduler = AIScheduler()
+
+
+def get_scheduler():
+    return _scheduler
+
+
+def configure_scheduler(max_concurrency, rate_per_minute, max_retries):
+    """按设置重建调度器，正在进行的请求继续使用旧的调度器"""
+    global _scheduler
+    _scheduler = AIScheduler(int(max_concurrency), int(rate_per_minute), int(max_retries))
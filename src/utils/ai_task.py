@@ -1,44 +1,86 @@
 from PySide6.QtCore import QObject, Signal, QRunnable
-from openai import OpenAI
+from src.utils.ai_client import get_client
+from src.utils.ai_scheduler import get_scheduler
+from src.utils.cancellation import CancellationToken
 
 
 class AITaskSignals(QObject):
     success = Signal(str)
     error = Signal(str)
+    chunk = Signal(str)  # 流式模式下每收到一段内容发送一次
 
 
 class AITask(QRunnable):
     def __init__(self, api_key: str, base_url: str = '', model: str = 'deepseek-chat', prompt: str = '',
-                 content: str = ''):
+                 content: str = '', stream: bool = False, token: CancellationToken = None):
         super().__init__()
         self.api_key = api_key
         self.base_url = base_url
         self.model = model
         self.prompt = prompt
         self.content = content
+        self.stream = stream
         self.signals = AITaskSignals()
+        self.token = token or CancellationToken()
+        self._emitted = False
+
+    def cancel(self):
+        self.token.cancel()
+
+    def emit(self, signal, *args):
+        """取消后不再发出任何信号"""
+        if not self.token.is_cancelled():
+            signal.emit(*args)
 
     def run(self):
         try:
             if not self.content.strip():
                 raise ValueError("用户输入内容不能为空！")
-            client = OpenAI(api_key=self.api_key, base_url=self.base_url)
-            response = client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {'role': 'system', 'content': self.prompt},
-                    {'role': 'user', 'content': self.content}
-                ],
-                stream=False,
-                timeout=60
-            )
-            if not response.choices:
-                raise ValueError("API 返回无有效结果！")
-
-            reply = response.choices[0].message.content
-            if not reply.strip():
+            client = get_client(self.api_key, self.base_url)
+
+            def request():
+                response = client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {'role': 'system', 'content': self.prompt},
+                        {'role': 'user', 'content': self.content}
+                    ],
+                    stream=self.stream,
+                    timeout=60
+                )
+                if not self.stream:
+                    return self._read_response(response)
+                # 取消时关闭 HTTP 流，正在阻塞的读取立即结束
+                unregister = self.token.register(response.close)
+                try:
+                    return self._read_stream(response)
+                finally:
+                    unregister()
+
+            # 流式输出已经发出部分内容后不再重试，避免报告中出现重复段落
+            reply = get_scheduler().run(request, can_retry=lambda: not self._emitted, token=self.token)
+            if not reply or not reply.strip():
                 raise ValueError("API 返回内容为空！")
-            self.signals.success.emit(reply)
+            self.emit(self.signals.success, reply)
 
         except Exception as e:
-            self.signals.error.emit(f'{type(e).__name__}: {e}')
+            self.emit(self.signals.error, f'{type(e).__name__}: {e}')
+
+    @staticmethod
+    def _read_response(response):
+        if not response.choices:
+            raise ValueError("API 返回无有效结果！")
+        return response.choices[0].message.content
+
+    def _read_stream(self, response):
+        """逐段读取流式响应，每段内容到达后立即通过 chunk 信号发出"""
+        parts = []
+        for event in response:
+            if not event.choices:
+                continue
+            delta = event.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                self._emitted = True
+                self.emit(self.signals.chunk, delta)
+        return ''.join(parts)
@@ -1,5 +1,5 @@
 from PySide6.QtCore import QObject, Signal, QRunnable
-from openai import OpenAI
+from src.utils.ai_client import get_client
 
 
 class ApiKeyCheckSignals(QObject):
@@ -17,7 +17,7 @@ class AIKeyCheckTask(QRunnable):
 
     def run(self):
         try:
-            client = OpenAI(api_key=self.api_key, base_url=self.base_url)
+            client = get_client(self.api_key, self.base_url)
             response = client.chat.completions.create(
                 model=self.model,
                 messages=[{"role": "user", "content": "Hi"}],
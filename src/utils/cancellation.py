@@ -0,0 +1,59 @@
+import threading
+
+
+class CancelledError(Exception):
+    """任务被用户停止"""
+
+
+class CancellationToken:
+    """
+    跨线程的取消标记，一次收集或一次报告生成共用一个。
+
+    界面线程调用 cancel()；工作线程在各阶段之间检查 is_cancelled()，
+    并通过 register() 登记取消时要执行的动作（结束 git 子进程、关闭 HTTP 流等），
+    使正在阻塞的读取立即返回。
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+
+    def cancel(self):
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+
+    def is_cancelled(self):
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise CancelledError()
+
+    def wait(self, timeout):
+        """等待 timeout 秒，期间被取消时立即返回 True"""
+        return self._event.wait(timeout)
+
+    def register(self, callback):
+        """
+        登记取消时执行的回调，已取消时立即执行；返回用于注销的函数，动作完成后应及时注销。
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._unregister(callback)
+        callback()
+        return lambda: None
+
+    def _unregister(self, callback):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
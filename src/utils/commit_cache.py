@@ -0,0 +1,239 @@
+import os
+import sqlite3
+import subprocess
+import threading
+from datetime import datetime
+
+from src.config.config import app_data_dir
+from src.utils.commits import Commit, parse_numstat, parse_tz_offset
+from src.utils.git_log_worker import BATCH_SIZE, hidden_subprocess_kwargs, iter_git_records
+
+INSERT_BATCH_SIZE = 5000
+
+
+class CommitCache:
+    """
+    基于 SQLite 的增量提交缓存。
+
+    按 仓库 + 分支 记录上一次遍历到的分支顶端（tip），再次获取时只遍历
+    last_tip..new_tip 之间新增的提交，日期、账号的筛选直接在本地索引中完成。
+    分支被强制推送（旧 tip 不再是新 tip 的祖先）时，重新遍历该分支的完整历史。
+    """
+    SCHEMA_VERSION = 1
+    _schema_lock = threading.Lock()
+    _schema_ready = set()
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or os.path.join(app_data_dir(), 'commits.db')
+
+    def connect(self):
+        """每个线程使用独立连接，WAL 模式下读写互不阻塞"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        with CommitCache._schema_lock:
+            if self.db_path not in CommitCache._schema_ready:
+                self._init_schema(conn)
+                CommitCache._schema_ready.add(self.db_path)
+        return conn
+
+    def _init_schema(self, conn):
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        if version != self.SCHEMA_VERSION:
+            # 缓存可以随时重建，结构变化时直接清空
+            conn.executescript('''
+                DROP TABLE IF EXISTS refs;
+                DROP TABLE IF EXISTS commits;
+                DROP TABLE IF EXISTS ref_commits;
+            ''')
+        conn.executescript(f'''
+            CREATE TABLE IF NOT EXISTS refs (
+                repo TEXT NOT NULL,
+                ref TEXT NOT NULL,
+                tip TEXT NOT NULL,
+                PRIMARY KEY (repo, ref)
+            );
+            CREATE TABLE IF NOT EXISTS commits (
+                repo TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                short_hash TEXT NOT NULL,
+                author TEXT NOT NULL,
+                commit_time INTEGER NOT NULL,
+                author_time INTEGER NOT NULL,
+                tz_offset INTEGER NOT NULL,
+                message TEXT NOT NULL,
+                added INTEGER,  -- 增删行数，NULL 表示尚未统计
+                removed INTEGER,
+                PRIMARY KEY (repo, hash)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS ref_commits (
+                repo TEXT NOT NULL,
+                ref TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                PRIMARY KEY (repo, ref, hash)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_commits_time ON commits (repo, commit_time);
+            PRAGMA user_version = {self.SCHEMA_VERSION};
+        ''')
+        conn.commit()
+
+    def sync(self, repo_path, ref_index, refs, token=None, full=True):
+        """
+        把 refs 同步到最新 tip，只遍历上次之后新增的提交。
+
+        full 为 False 时只做增量同步：首次缓存或被改写的分支需要遍历完整历史，不在这里处理，
+        而是作为返回值交给调用方（收集任务改用按日期范围的 git log，缓存由后台任务补全）。
+
+        每写入 INSERT_BATCH_SIZE 个提交就提交一次事务，遍历大仓库时其它项目的任务不会长时间等待写锁。
+        分支的 tip 最后写入：中途取消时已写入的提交保留（INSERT OR IGNORE 可重复写入），
+        但 tip 仍是旧值，下次同步会重新遍历该分支。
+        """
+        repo = os.path.normcase(os.path.abspath(repo_path))
+        conn = self.connect()
+        uncached = []
+        try:
+            for ref in refs:
+                if token is not None:
+                    token.raise_if_cancelled()
+                tip = ref_index.tip(ref)
+                if not tip:
+                    raise RuntimeError(f"找不到分支 {ref}")
+                row = conn.execute('SELECT tip FROM refs WHERE repo = ? AND ref = ?', (repo, ref)).fetchone()
+                last_tip = row[0] if row else None
+                if last_tip == tip:
+                    continue
+
+                if last_tip and self._is_ancestor(repo_path, last_tip, tip):
+                    rev_range = [tip, f'^{last_tip}']
+                elif not full:
+                    uncached.append(ref)
+                    continue
+                else:
+                    # 首次缓存或分支被改写，重新遍历完整历史；先删除 tip，中途取消时不会留下半份缓存
+                    with conn:
+                        conn.execute('DELETE FROM refs WHERE repo = ? AND ref = ?', (repo, ref))
+                        conn.execute('DELETE FROM ref_commits WHERE repo = ? AND ref = ?', (repo, ref))
+                    rev_range = [tip]
+
+                batch = []
+                for commit in self._walk(repo_path, rev_range, token):
+                    batch.append(commit)
+                    if len(batch) >= INSERT_BATCH_SIZE:
+                        self._insert(conn, repo, ref, batch)
+                        batch = []
+                self._insert(conn, repo, ref, batch)
+                with conn:
+                    conn.execute('INSERT OR REPLACE INTO refs VALUES (?, ?, ?)', (repo, ref, tip))
+        finally:
+            conn.close()
+        return uncached
+
+    def query(self, repo_path, project_name, refs, authors, since, until, batch_size=BATCH_SIZE, token=None):
+        """
+        从索引中查询指定分支、时间范围内的提交，逐批返回 {(branch, author): [Commit]}。
+
+        第一批是所有分支、账号组合的空分组，保证没有提交的组合也会按顺序出现；
+        之后每批最多 batch_size 个提交，与直接读取 git log 时的分批方式相同。
+        一个提交属于多个分支时，只归入 refs 中排在最前面、且包含它的分支，与 GitLogTask 直接读取时相同。
+        同步时不统计增删行数，每批中尚未统计的提交在这里补上并写回缓存，只有实际查询到的提交才计算 diff。
+        """
+        repo = os.path.normcase(os.path.abspath(repo_path))
+        since_ts = int(datetime.fromisoformat(since).timestamp())
+        until_ts = int(datetime.fromisoformat(until).timestamp())
+        placeholders = ', '.join('?' * len(refs))
+        priority = ' '.join(f'WHEN ? THEN {i}' for i in range(len(refs)))
+        conn = self.connect()
+        try:
+            rows = conn.execute(f'''
+                SELECT MIN(CASE rc.ref {priority} END), c.hash, c.short_hash, c.author, c.author_time, c.tz_offset,
+                       c.message, c.added, c.removed
+                FROM ref_commits rc JOIN commits c ON c.repo = rc.repo AND c.hash = rc.hash
+                WHERE rc.repo = ? AND rc.ref IN ({placeholders})
+                  AND c.commit_time BETWEEN ? AND ?
+                GROUP BY c.hash
+                ORDER BY c.commit_time DESC
+            ''', (*refs, repo, *refs, since_ts, until_ts)).fetchall()
+
+            yield {(ref, author): [] for ref in refs for author in authors}
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                pending = [row[1] for row in batch
+                           if row[7] is None and any(author in row[3] for author in authors)]
+                numstat = self._fill_numstat(conn, repo_path, repo, pending, token)
+                yield self._group(batch, numstat, refs, authors, project_name)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _group(rows, numstat, refs, authors, project_name):
+        grouped = {}
+        for index, commit_hash, short_hash, author_line, author_time, tz_offset, message, added, removed in rows:
+            if added is None:
+                added, removed = numstat.get(commit_hash, (0, 0))
+            ref = refs[index]
+            for author in authors:
+                if author in author_line:
+                    grouped.setdefault((ref, author), []).append(
+                        Commit(short_hash, author_time, tz_offset, message, project_name, ref, author, added, removed)
+                    )
+        return grouped
+
+    def _fill_numstat(self, conn, repo_path, repo, hashes, token=None):
+        """统计 hashes 的增删行数并写回缓存，返回 {hash: (added, removed)}"""
+        if not hashes:
+            return {}
+        numstat = {commit_hash: (0, 0) for commit_hash in hashes}
+        for parts in self._walk_numstat(repo_path, hashes, token):
+            numstat[parts[0]] = parse_numstat(parts[1])
+        with conn:
+            conn.executemany(
+                'UPDATE commits SET added = ?, removed = ? WHERE repo = ? AND hash = ?',
+                ((added, removed, repo, commit_hash) for commit_hash, (added, removed) in numstat.items())
+            )
+        return numstat
+
+    @staticmethod
+    def _insert(conn, repo, ref, commits):
+        """在一个短事务中写入一批提交"""
+        if not commits:
+            return
+        with conn:
+            conn.executemany(
+                'INSERT OR IGNORE INTO commits VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                ((repo, *commit) for commit in commits)
+            )
+            conn.executemany(
+                'INSERT OR IGNORE INTO ref_commits VALUES (?, ?, ?)',
+                ((repo, ref, commit[0]) for commit in commits)
+            )
+
+    @staticmethod
+    def _is_ancestor(repo_path, ancestor, descendant):
+        result = subprocess.run(
+            ['git', 'merge-base', '--is-ancestor', ancestor, descendant],
+            cwd=repo_path,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            **hidden_subprocess_kwargs()
+        )
+        return result.returncode == 0
+
+    @staticmethod
+    def _walk(repo_path, rev_range, token=None):
+        """遍历完整历史时不计算 diff，增删行数留空（NULL），查询到时再统计"""
+        cmd = [
+            'git', 'log',
+            '--pretty=format:%H%x1f%h%x1f%an <%ae>%x1f%ct%x1f%at%x1f%ad%x1f%s%n%b%x1e',
+            '--date=format:%z',
+            *rev_range,
+            '--'
+        ]
+        for parts in iter_git_records(cmd, repo_path, 7, token):
+            yield (parts[0], parts[1], parts[2], int(parts[3]), int(parts[4]), parse_tz_offset(parts[5]),
+                   parts[6].strip(), None, None)
+
+    @staticmethod
+    def _walk_numstat(repo_path, hashes, token=None):
+        # 与 GitLogTask 相同：记录分隔符放在开头，--numstat 的输出作为最后一个字段
+        cmd = ['git', 'log', '--no-walk=unsorted', '--numstat', '--pretty=format:%x1e%H%x1f', *hashes, '--']
+        return iter_git_records(cmd, repo_path, 2, token)
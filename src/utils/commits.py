@@ -0,0 +1,61 @@
+import sys
+import time
+
+
+def parse_tz_offset(text):
+    """把 git 输出的时区（如 +0800）转换为分钟数"""
+    text = text.strip()
+    if len(text) != 5:
+        return 0
+    minutes = int(text[1:3]) * 60 + int(text[3:5])
+    return -minutes if text[0] == '-' else minutes
+
+
+def parse_numstat(text):
+    """
+    汇总 git log --numstat 输出的增删行数，返回 (added, removed)。
+    每行为 “新增<TAB>删除<TAB>路径”，二进制文件的行数为 -，按 0 计。
+    """
+    added = removed = 0
+    for line in text.splitlines():
+        parts = line.split('\t', 2)
+        if len(parts) == 3:
+            if parts[0].isdigit():
+                added += int(parts[0])
+            if parts[1].isdigit():
+                removed += int(parts[1])
+    return added, removed
+
+
+class Commit:
+    """
+    单个提交记录，由收集任务、去重和报告生成共用。
+
+    使用 __slots__ 省去每个实例的 __dict__；日期保存为整数时间戳和时区偏移，
+    需要展示时再格式化；项目、分支、账号这类大量重复的字符串通过 sys.intern 共享。
+    """
+    __slots__ = ('commit', 'timestamp', 'tz_offset', 'message', 'project', 'branch', 'author', 'added', 'removed')
+
+    def __init__(self, commit, timestamp, tz_offset, message, project='', branch='', author='', added=0, removed=0):
+        self.commit = commit
+        self.timestamp = timestamp
+        self.tz_offset = tz_offset
+        self.message = message
+        self.project = sys.intern(project)
+        self.branch = sys.intern(branch)
+        self.author = sys.intern(author)
+        self.added = added  # 新增行数（git log --numstat）
+        self.removed = removed  # 删除行数
+
+    @property
+    def date(self):
+        """与 git log --date=iso 相同的格式，例如 2025-07-15 10:38:29 +0800"""
+        # 直接拼接字段，比 datetime.strftime 快得多，大量提交渲染时差异明显
+        t = time.gmtime(self.timestamp + self.tz_offset * 60)
+        sign = '-' if self.tz_offset < 0 else '+'
+        hours, minutes = divmod(abs(self.tz_offset), 60)
+        return (f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d} "
+                f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d} {sign}{hours:02d}{minutes:02d}")
+
+    def __repr__(self):
+        return f"Commit({self.commit!r}, {self.date!r}, {self.message!r})"
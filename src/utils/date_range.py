@@ -0,0 +1,70 @@
+from datetime import date
+
+import pendulum
+
+CUSTOM_PERIOD = '自定义'
+DATE_OPTIONS = [
+    '今日', '昨日', '本周', '上周',
+    '本月', '上个月', '本季度', '上季度',
+    '上半年', '下半年', '今年', CUSTOM_PERIOD
+]
+
+
+def get_date_range(text: str) -> tuple[date, date]:
+    """按时间段名称（今日、本周、上个月……）返回起止日期，无法识别的名称按今日处理"""
+    now = pendulum.today()
+    match text:
+        case '今日':
+            start = end = now
+        case '昨日':
+            start = end = now.subtract(days=1)
+        case '本周':
+            start = now.start_of('week')
+            end = now.end_of('week')
+        case '上周':
+            last_week = now.subtract(weeks=1)
+            start = last_week.start_of('week')
+            end = last_week.end_of('week')
+        case '本月':
+            start = now.start_of('month')
+            end = now.end_of('month')
+        case '上个月':
+            last_month = now.subtract(months=1)
+            start = last_month.start_of('month')
+            end = last_month.end_of('month')
+        case '本季度':
+            quarter = (now.month - 1) // 3 + 1
+            start = pendulum.datetime(now.year, 3 * (quarter - 1) + 1, 1)
+            end = start.add(months=3).subtract(days=1)
+        case '上季度':
+            quarter = (now.month - 1) // 3
+            if quarter == 0:
+                start = pendulum.datetime(now.year - 1, 10, 1)
+            else:
+                start = pendulum.datetime(now.year, 3 * (quarter - 1) + 1, 1)
+            end = start.add(months=3).subtract(days=1)
+        case '上半年':
+            start = pendulum.datetime(now.year, 1, 1)
+            end = pendulum.datetime(now.year, 6, 30)
+        case '下半年':
+            start = pendulum.datetime(now.year, 7, 1)
+            end = pendulum.datetime(now.year, 12, 31)
+        case '今年':
+            start = now.start_of('year')
+            end = now.end_of('year')
+        case _:
+            start = end = now
+
+    return start.date(), end.date()
+
+
+def git_time_range(since: date, until: date) -> tuple[str, str]:
+    """把起止日期转换为 git log 使用的时间字符串：起始日 00:00:00 至结束日 23:59:59"""
+    start = pendulum.datetime(since.year, since.month, since.day, 0, 0, 0)
+    end = pendulum.datetime(until.year, until.month, until.day, 23, 59, 59)
+    return start.to_iso8601_string(), end.to_iso8601_string()
+
+
+def get_datetime_range(text: str) -> tuple[str, str]:
+    """返回时间段对应的 git log 时间字符串"""
+    return git_time_range(*get_date_range(text))
@@ -0,0 +1,80 @@
+from PySide6.QtCore import QObject, Signal, QRunnable, QThreadPool
+from git import Repo, GitCommandError
+
+
+class GitFetchSignals(QObject):
+    finished = Signal(str, str, bool, str)  # project, remote, success, message
+
+
+class GitFetchTask(QRunnable):
+    """
+    拉取单个项目的单个远程仓库。
+    """
+    def __init__(self, repo_path, project_name, remote_name, signals):
+        super().__init__()
+        self.repo_path = repo_path
+        self.project_name = project_name
+        self.remote_name = remote_name
+        self.signals = signals
+
+    def run(self):
+        try:
+            Repo(self.repo_path).remote(self.remote_name).fetch()
+            self.signals.finished.emit(self.project_name, self.remote_name, True, "")
+        except GitCommandError as e:
+            self.signals.finished.emit(self.project_name, self.remote_name, False, str(e.stderr).strip())
+        except Exception as e:
+            self.signals.finished.emit(self.project_name, self.remote_name, False, str(e))
+
+
+class GitFetchManager(QObject):
+    """
+    使用独立线程池并发拉取多个项目的所有远程仓库，逐个远程汇报进度，结束后给出汇总。
+    """
+    finished = Signal(list)  # [(project, remote, success, message)]
+    progress = Signal(int, int)  # done, total
+    remote_finished = Signal(str, str, bool, str)  # project, remote, success, message
+
+    def __init__(self, max_threads=4):
+        super().__init__()
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(max(1, max_threads))
+        self.total_tasks = 0
+        self.results = []
+        self.signals = GitFetchSignals()
+        self.signals.finished.connect(self._on_task_finished)
+
+    def is_running(self):
+        return len(self.results) < self.total_tasks
+
+    def start(self, project_paths):
+        """
+        project_paths: {项目名: 仓库路径}
+        """
+        self.total_tasks = 0
+        self.results = []
+        tasks = []
+        for project_name, repo_path in project_paths.items():
+            try:
+                remotes = [remote.name for remote in Repo(repo_path).remotes]
+            except Exception as e:
+                self.results.append((project_name, "", False, str(e)))
+                continue
+            for remote_name in remotes:
+                tasks.append(GitFetchTask(repo_path, project_name, remote_name, self.signals))
+
+        self.total_tasks = len(tasks) + len(self.results)
+        if not tasks:
+            self.finished.emit(self.results)
+            return
+
+        self.progress.emit(len(self.results), self.total_tasks)
+        for task in tasks:
+            self.thread_pool.start(task)
+
+    def _on_task_finished(self, project, remote, success, message):
+        self.results.append((project, remote, success, message))
+        self.remote_finished.emit(project, remote, success, message)
+        self.progress.emit(len(self.results), self.total_tasks)
+        if len(self.results) == self.total_tasks:
+            self.finished.emit(self.results)
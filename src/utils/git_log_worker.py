@@ -1,105 +1,416 @@
 from PySide6.QtCore import QObject, Signal, QRunnable, QThreadPool
+import math
+import os
 import subprocess
+import tempfile
+import threading
+import time
+
+from src.utils.cancellation import CancellationToken, CancelledError
+from src.utils.commits import Commit, parse_numstat, parse_tz_offset
+
+BATCH_SIZE = 500  # 每批发送给界面的提交数
+MAX_GIT_THREADS = 16
+
+
+def default_git_threads():
+    """git 收集线程数的默认上限：按 CPU 核数，最多 MAX_GIT_THREADS"""
+    return max(2, min(MAX_GIT_THREADS, os.cpu_count() or 4))
+
+
+def hidden_subprocess_kwargs():
+    """Windows 下隐藏 git 子进程的控制台窗口，其它平台无需额外参数。"""
+    if os.name != 'nt':
+        return {}
+    startupinfo = subprocess.STARTUPINFO()
+    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    startupinfo.wShowWindow = subprocess.SW_HIDE
+    return {'startupinfo': startupinfo, 'creationflags': subprocess.CREATE_NO_WINDOW}
+
+
+def iter_git_records(args, cwd, fields, token=None):
+    """
+    流式执行 git 命令，按 \\x1e 分隔的记录逐条解析，返回每条记录按 \\x1f 拆分后的字段。
+
+    输出不再整体缓存在内存中，字段数不等于 fields 的记录会被跳过。
+    记录首尾只去掉换行：str.strip() 会把 \\x1f 也当作空白去掉，导致末尾的空字段丢失。
+    传入 token 时，取消会立即结束 git 子进程并抛出 CancelledError。
+    """
+    # stderr 写入临时文件，避免读取 stdout 时 stderr 管道写满导致死锁
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(
+            args,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+            encoding="utf-8",
+            **hidden_subprocess_kwargs()
+        )
+        unregister = token.register(process.kill) if token is not None else None
+        try:
+            buffer = ''
+            while True:
+                chunk = process.stdout.read(65536)
+                if not chunk:
+                    break
+                buffer += chunk
+                *entries, buffer = buffer.split('\x1e')
+                for entry in entries:
+                    parts = entry.strip('\r\n').split('\x1f')
+                    if len(parts) == fields:
+                        yield parts
+            parts = buffer.strip('\r\n').split('\x1f')
+            if len(parts) == fields:
+                yield parts
+        finally:
+            if unregister is not None:
+                unregister()
+            process.stdout.close()
+            returncode = process.wait()
+
+        if token is not None:
+            token.raise_if_cancelled()
+        if returncode != 0:
+            stderr.seek(0)
+            raise RuntimeError(stderr.read().decode("utf-8", errors="replace").strip())
+
+
+class RefIndex:
+    """
+    单个仓库的引用索引，由一次 git for-each-ref 生成，按完整引用名精确匹配。
+    """
+    def __init__(self, refs, load_time=0.0):
+        self.refs = dict(refs)  # 完整引用名 -> 指向的提交
+        self.load_time = load_time  # 执行 git for-each-ref 的耗时（秒）
+
+    @classmethod
+    def load(cls, repo_path):
+        started = time.monotonic()
+        result = subprocess.run(
+            ['git', 'for-each-ref', '--format=%(refname)%00%(objectname)'],
+            cwd=repo_path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            encoding="utf-8",
+            **hidden_subprocess_kwargs()
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip())
+        return cls((line.strip().split('\x00', 1) for line in result.stdout.splitlines() if line.strip()),
+                   time.monotonic() - started)
+
+    def resolve(self, branch):
+        """本地分支存在同名的 origin 远程分支时，优先使用远程分支。"""
+        if branch.startswith("origin/"):
+            return branch
+        if f"refs/remotes/origin/{branch}" in self.refs:
+            return f"origin/{branch}"
+        return branch
+
+    def local_branches(self):
+        """本地分支名列表，按引用名排序（与 git branch 输出顺序一致）"""
+        return sorted(ref[len("refs/heads/"):] for ref in self.refs if ref.startswith("refs/heads/"))
+
+    def tip(self, branch):
+        """返回分支当前指向的提交，找不到时返回 None"""
+        for prefix in ("refs/heads/", "refs/remotes/", "refs/tags/"):
+            if prefix + branch in self.refs:
+                return self.refs[prefix + branch]
+        return self.refs.get(branch)
+
+
+class RefIndexCache:
+    """
+    一次收集过程内共享的引用索引缓存，每个仓库只执行一次 git for-each-ref。
+    """
+    def __init__(self):
+        self._indexes = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, repo_path):
+        with self._lock:
+            lock = self._locks.setdefault(repo_path, threading.Lock())
+        # 每个仓库单独加锁，同一仓库的并发任务等待首次加载完成后直接复用
+        with lock:
+            if repo_path not in self._indexes:
+                self._indexes[repo_path] = RefIndex.load(repo_path)
+            return self._indexes[repo_path]
+
+
+class AdaptiveLimit:
+    """
+    按 git 的响应延迟调整并发数（梯度法）。
+
+    延迟取每个仓库 git for-each-ref 的耗时：它只读取引用，与仓库历史的大小和查询的时间范围无关，
+    主要反映进程启动和磁盘（网络盘）的响应，不同仓库、不同时间范围之间可以直接比较。
+    分别维护延迟的长期均值和短期均值：短期延迟明显高于长期水平，说明磁盘或网络盘已经饱和，
+    按比例收缩并发；延迟平稳时每次增加约 sqrt(limit)，逐步放宽到 max_limit。
+    第一个样本只用来建立基准，不调整并发数。
+    """
+    TOLERANCE = 0.8  # 短期延迟不超过长期水平的 1.25 倍时视为平稳
+
+    def __init__(self, max_limit, initial=None):
+        self.max_limit = max(1, max_limit)
+        self.limit = float(min(self.max_limit, initial or max(2, self.max_limit // 2)))
+        self.long_latency = None
+        self.short_latency = None
+
+    def update(self, latency):
+        """记录一个样本的延迟（秒），返回新的并发数"""
+        latency = max(latency, 0.001)
+        if self.long_latency is None:
+            self.long_latency = self.short_latency = latency
+            return int(self.limit)
+        self.short_latency = 0.5 * self.short_latency + 0.5 * latency
+        self.long_latency = 0.9 * self.long_latency + 0.1 * latency
+        gradient = self.long_latency / self.short_latency
+        if gradient < self.TOLERANCE:
+            self.limit = max(1.0, self.limit * max(0.5, gradient))
+            # 收缩后让长期水平向当前延迟靠拢，避免一次变慢后长时间压在低并发
+            self.long_latency = 0.5 * self.long_latency + 0.5 * self.short_latency
+        else:
+            self.limit = min(self.max_limit, self.limit + math.sqrt(self.limit))
+        return int(self.limit)
 
 
 class GitLogSignals(QObject):
-    finished = Signal(str, str, str, list)  # project, branch, author, logs
-    error = Signal(str)
+    batch = Signal(str, object)  # project, {(branch, author): [Commit]}
+    finished = Signal(str)  # project
+    latency = Signal(float)  # git for-each-ref 的耗时（秒），用于调整并发数
+    error = Signal(str)  # 整个任务失败
+    warning = Signal(str)  # 部分分支失败，任务继续
     progress = Signal(int, int)  # done_count, total_count
     all_finished = Signal()
+    uncached = Signal(str, list)  # repo_path, 尚未缓存的分支
+
+
+class CacheFillSignals(QObject):
+    finished = Signal(str)  # repo_path
+
+
+class CacheFillTask(QRunnable):
+    """
+    在后台为尚未缓存的分支遍历完整历史、建立提交缓存，之后这些分支的收集直接查询缓存。
+    缓存可以随时重建，失败时只打印原因，下次收集会重新安排。
+    """
+    def __init__(self, repo_path, refs, commit_cache, signals, token):
+        super().__init__()
+        self.repo_path = repo_path
+        self.refs = list(refs)
+        self.commit_cache = commit_cache
+        self.signals = signals
+        self.token = token
+
+    def run(self):
+        try:
+            ref_index = RefIndex.load(self.repo_path)
+            refs = [ref for ref in self.refs if ref_index.tip(ref)]
+            self.commit_cache.sync(self.repo_path, ref_index, refs, self.token)
+        except CancelledError:
+            pass
+        except Exception as e:
+            print(f"更新提交缓存失败 [{self.repo_path}]：{e}")
+        finally:
+            # 取消只发生在退出程序时，此时管理器可能已经销毁
+            if not self.token.is_cancelled():
+                self.signals.finished.emit(self.repo_path)
 
 
 class GitLogTask(QRunnable):
-    def __init__(self, repo_path, project_name, branch, author, since, until, signals):
+    """
+    对单个项目收集所有勾选分支、所有选中账号的提交。
+
+    一个提交属于多个分支时，只归入 branches 中排在最前面、且包含它的分支，与提交缓存的查询规则相同，
+    因此首次（直接读取）和之后（查询缓存）的分组结果一致。分支按顺序依次执行 git log，
+    每个分支排除前面的分支已经包含的提交（git log B ^A），公共历史只输出一次；
+    每次 git log 同时覆盖所有账号，再在 Python 中按账号拆分。
+    传入 commit_cache 时先增量同步本地提交缓存，再从缓存中分批查询；有分支尚未建立缓存时，
+    本次仍直接执行 git log，并通过 uncached 信号请求在后台补全缓存。
+    token 被取消后结束 git 子进程，不再发出任何信号。
+    """
+    def __init__(self, repo_path, project_name, branches, authors, since, until, signals, ref_cache=None,
+                 commit_cache=None, token=None):
         super().__init__()
         self.repo_path = repo_path
         self.project_name = project_name
-        self.branch = branch
-        self.author = author
+        self.branches = list(branches)
+        self.authors = list(authors)
         self.since = since
         self.until = until
         self.signals = signals
+        self.ref_cache = ref_cache or RefIndexCache()
+        self.commit_cache = commit_cache
+        self.token = token or CancellationToken()
+
+    def emit(self, signal, *args):
+        """取消后到达的结果直接丢弃"""
+        if not self.token.is_cancelled():
+            signal.emit(*args)
 
     def run(self):
         try:
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            startupinfo.wShowWindow = subprocess.SW_HIDE
-
-            if not self.branch.startswith("origin/"):
-                # 获取所有分支，包含 remote 的
-                result = subprocess.run(['git', 'branch', '-a'], cwd=self.repo_path,
-                                        stdout=subprocess.PIPE, text=True, startupinfo=startupinfo, creationflags=subprocess.CREATE_NO_WINDOW)
-                all_branches = result.stdout
-                possible_remote = f"remotes/origin/{self.branch}"
-                if possible_remote in all_branches:
-                    self.branch = f"origin/{self.branch}"
-            cmd = [
-                'git', 'log',
-                f'--author={self.author}',
+            self.token.raise_if_cancelled()
+            ref_index = self.ref_cache.get(self.repo_path)
+            self.emit(self.signals.latency, ref_index.load_time)
+            branches = []
+            missing = []
+            for branch in self.branches:
+                branch = ref_index.resolve(branch)
+                if ref_index.tip(branch) is None:
+                    missing.append(branch)
+                elif branch not in branches:
+                    branches.append(branch)
+            # 已删除的分支单独报告，不影响其余分支的收集
+            if not branches:
+                self.emit(self.signals.error, f"{self.project_name} 分支 {', '.join(missing)} 不存在")
+                return
+            if missing:
+                self.emit(self.signals.warning, f"{self.project_name} 分支 {', '.join(missing)} 不存在，已跳过")
+
+            if self.commit_cache is not None:
+                uncached = self.commit_cache.sync(self.repo_path, ref_index, branches, self.token, full=False)
+                if not uncached:
+                    for grouped in self.commit_cache.query(self.repo_path, self.project_name, branches,
+                                                           self.authors, self.since, self.until,
+                                                           token=self.token):
+                        self.emit(self.signals.batch, self.project_name, grouped)
+                    self.emit(self.signals.finished, self.project_name)
+                    return
+                # 有分支尚未缓存（需要遍历完整历史），本次直接按日期范围读取，缓存交给后台补全
+                self.emit(self.signals.uncached, self.repo_path, uncached)
+
+            # 多个 --author 之间是“或”的关系，一次遍历即可取到所有账号的提交
+            # --numstat 的输出跟在每个提交的格式化内容之后，因此记录分隔符放在开头，增删行数作为最后一个字段
+            cmd = ['git', 'log', '--fixed-strings', '--numstat']
+            cmd += [f'--author={author}' for author in self.authors]
+            cmd += [
                 f'--since={self.since}',
                 f'--until={self.until}',
-                '--pretty=format:%h%x1f%ad%x1f%s%n%b%x1e',
-                '--date=iso',
-                self.branch
+                '--pretty=format:%x1e%h%x1f%at%x1f%ad%x1f%an <%ae>%x1f%s%n%b%x1f',
+                '--date=format:%z',
             ]
-            result = subprocess.run(
-                cmd,
-                cwd=self.repo_path,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                encoding="utf-8",
-                startupinfo=startupinfo,
-                creationflags=subprocess.CREATE_NO_WINDOW
+
+            # 先发送空分组，保证没有提交的分支、账号组合也会按顺序出现
+            self.emit(
+                self.signals.batch,
+                self.project_name, {(branch, author): [] for branch in branches for author in self.authors}
             )
-            if result.returncode != 0:
-                self.signals.error.emit(
-                    f"{self.project_name} 分支 {self.branch} 获取失败：{result.stderr.strip()}"
-                )
-                return
+            grouped = {}
+            count = 0
+            for index, branch in enumerate(branches):
+                rev_range = [branch, *(f'^{previous}' for previous in branches[:index]), '--']
+                try:
+                    for parts in iter_git_records(cmd + rev_range, self.repo_path, 6, self.token):
+                        commit_hash, timestamp, tz_offset = parts[0], int(parts[1]), parse_tz_offset(parts[2])
+                        message = parts[4].strip()
+                        added, removed = parse_numstat(parts[5])
+                        # 与 git --author 的匹配规则保持一致：在 “姓名 <邮箱>” 中查找
+                        for author in self.authors:
+                            if author in parts[3]:
+                                grouped.setdefault((branch, author), []).append(
+                                    Commit(commit_hash, timestamp, tz_offset, message, self.project_name, branch,
+                                           author, added, removed)
+                                )
+                        count += 1
+                        if count >= BATCH_SIZE:
+                            self.emit(self.signals.batch, self.project_name, grouped)
+                            grouped = {}
+                            count = 0
+                except RuntimeError as e:
+                    self.emit(self.signals.error, f"{self.project_name} 分支 {branch} 获取失败：{e}")
+                    return
 
-            raw_output = result.stdout.rstrip('\x1e').split('\x1e')
-            logs = []
-            for entry in raw_output:
-                if not entry.strip():
-                    continue
-                parts = entry.strip().split('\x1f')
-                if len(parts) == 3:
-                    logs.append({
-                        "commit": parts[0],
-                        "date": parts[1],
-                        "message": parts[2].strip()
-                    })
-
-            self.signals.finished.emit(self.project_name, self.branch, self.author, logs)
+            if grouped:
+                self.emit(self.signals.batch, self.project_name, grouped)
+            self.emit(self.signals.finished, self.project_name)
 
+        except CancelledError:
+            pass
         except Exception as e:
-            self.signals.error.emit(f"[{self.project_name}:{self.branch}] 异常：{e}")
+            self.emit(self.signals.error, f"[{self.project_name}] 异常：{e}")
 
 
 class GitLogManager(QObject):
     """
     管理所有 GitLogTask 并发执行，统计进度。
+
+    每个项目只提交一个任务（所有分支、所有账号合并为一次 git log），进度按项目计数。
+    提交记录按批通过 log_collected 陆续发出，界面可以边收集边显示。
+    每次 start 使用新的取消标记和信号对象，cancel 后旧任务的结果全部丢弃。
+
+    任务运行在独立的线程池中，不影响全局线程池；线程数上限默认按 CPU 核数，
+    实际并发由 AdaptiveLimit 根据 git 的响应延迟调整，并在多次收集之间保留。
+    补全提交缓存的任务在单独的单线程池中逐个仓库执行，不占用收集线程，也不随 start、cancel 停止；
+    退出程序前调用 shutdown 结束。
     """
     finished = Signal()
+    cancelled = Signal()
     progress = Signal(int, int)  # done, total
-    log_collected = Signal(str, str, str, list)  # project, branch, author, logs
+    log_collected = Signal(str, str, str, list)  # project, branch, author, [Commit]
     error = Signal(str)
 
-    def __init__(self, max_threads=None):
+    def __init__(self, max_threads=None, commit_cache=None):
         super().__init__()
-        self.thread_pool = QThreadPool.globalInstance()
-        if max_threads:
-            self.thread_pool.setMaxThreadCount(max_threads)
+        self.commit_cache = commit_cache
+        self.thread_pool = QThreadPool()
+        self.adaptive_limit = None
+        self.set_max_threads(max_threads)
         self.total_tasks = 0
         self.done_tasks = 0
-        self.signals = GitLogSignals()
-        self.signals.finished.connect(self._on_task_finished)
-        self.signals.error.connect(self._on_task_error)
+        self.ref_cache = RefIndexCache()
+        self.token = CancellationToken()
+        self.signals = None
+        self.cache_pool = QThreadPool()
+        self.cache_pool.setMaxThreadCount(1)
+        self.cache_token = CancellationToken()
+        self.cache_signals = CacheFillSignals()
+        self.cache_signals.finished.connect(self._on_cache_filled)
+        self.cache_fills = set()  # 正在补全缓存的仓库，同一仓库同时只补全一次
+
+    def set_max_threads(self, max_threads=None):
+        """设置线程数上限，None 或 0 表示按 CPU 核数自动决定；上限不变时保留已学习的并发数"""
+        max_threads = max_threads or default_git_threads()
+        if self.adaptive_limit is not None and self.adaptive_limit.max_limit == max_threads:
+            return
+        self.adaptive_limit = AdaptiveLimit(max_threads)
+        self.thread_pool.setMaxThreadCount(int(self.adaptive_limit.limit))
+
+    def is_running(self):
+        return self.done_tasks < self.total_tasks and not self.token.is_cancelled()
+
+    def cancel(self):
+        """停止正在进行的收集：结束 git 子进程，未开始的任务直接跳过"""
+        if not self.is_running():
+            return
+        self.token.cancel()
+        self.signals.blockSignals(True)
+        self.cancelled.emit()
+
+    def wait_for_cache(self, msecs):
+        """等待后台缓存补全结束，返回是否已全部完成"""
+        return self.cache_pool.waitForDone(msecs)
+
+    def shutdown(self):
+        """停止收集和后台的缓存补全（结束 git 子进程），用于退出程序前"""
+        self.cancel()
+        self.cache_token.cancel()
+        self.cache_pool.clear()
 
     def start(self, project_map, selected_authors, since, until):
+        self.cancel()
         self.total_tasks = 0
         self.done_tasks = 0
+        self.token = CancellationToken()
+        self.signals = GitLogSignals()
+        self.signals.batch.connect(self._on_task_batch)
+        self.signals.finished.connect(self._on_task_finished)
+        self.signals.error.connect(self._on_task_error)
+        self.signals.warning.connect(self._on_task_warning)
+        self.signals.uncached.connect(self._on_task_uncached)
+        self.signals.latency.connect(self._on_task_latency)
+        # 引用索引只在本次收集内有效，避免使用上一次运行时的旧分支列表
+        self.ref_cache = RefIndexCache()
 
         # 预处理日期字符串
         if hasattr(since, 'toString'):
@@ -110,11 +421,13 @@ class GitLogManager(QObject):
         # 提交所有任务
         for project_name, project_info in project_map.items():
             repo_path = project_info["path"]
-            for branch in project_info["branches"]:
-                for author in selected_authors:
-                    task = GitLogTask(repo_path, project_name, branch, author, since, until, self.signals)
-                    self.thread_pool.start(task)
-                    self.total_tasks += 1
+            branches = project_info["branches"]
+            if not branches:
+                continue
+            task = GitLogTask(repo_path, project_name, branches, selected_authors, since, until, self.signals,
+                              self.ref_cache, self.commit_cache, self.token)
+            self.thread_pool.start(task)
+            self.total_tasks += 1
 
         if self.total_tasks == 0:
             # 无任务时直接发完成信号
@@ -122,14 +435,41 @@ class GitLogManager(QObject):
         else:
             self.progress.emit(self.done_tasks, self.total_tasks)
 
-    def _on_task_finished(self, project, branch, author, logs):
+    def _on_task_batch(self, project, grouped):
+        if self.token.is_cancelled():
+            return
+        for (branch, author), logs in grouped.items():
+            self.log_collected.emit(project, branch, author, logs)
+
+    def _on_task_uncached(self, repo_path, refs):
+        if self.commit_cache is None or repo_path in self.cache_fills or self.cache_token.is_cancelled():
+            return
+        self.cache_fills.add(repo_path)
+        self.cache_pool.start(CacheFillTask(repo_path, refs, self.commit_cache, self.cache_signals, self.cache_token))
+
+    def _on_cache_filled(self, repo_path):
+        self.cache_fills.discard(repo_path)
+
+    def _on_task_latency(self, seconds):
+        if self.token.is_cancelled():
+            return
+        self.thread_pool.setMaxThreadCount(self.adaptive_limit.update(seconds))
+
+    def _on_task_finished(self, project):
+        if self.token.is_cancelled():
+            return
         self.done_tasks += 1
-        self.log_collected.emit(project, branch, author, logs)
         self.progress.emit(self.done_tasks, self.total_tasks)
         if self.done_tasks == self.total_tasks:
             self.finished.emit()
 
+    def _on_task_warning(self, message):
+        if not self.token.is_cancelled():
+            self.error.emit(message)
+
     def _on_task_error(self, message):
+        if self.token.is_cancelled():
+            return
         self.done_tasks += 1
         self.error.emit(message)
         self.progress.emit(self.done_tasks, self.total_tasks)
@@ -0,0 +1,143 @@
+import os
+
+from PySide6.QtCore import QObject, Signal, QFileSystemWatcher, QTimer
+
+
+def find_git_common_dir(path):
+    """
+    查找 path 所在仓库存放引用的目录（包含 refs/ 和 packed-refs），找不到时返回 None。
+
+    依次向上查找 .git：普通仓库是目录；工作树（worktree）和子模块是写有 gitdir: 的文件，
+    工作树的分支保存在主仓库中，由其中的 commondir 指出。path 本身是裸仓库时直接返回。
+    """
+    path = os.path.abspath(path)
+    if os.path.isfile(os.path.join(path, 'HEAD')) and os.path.isdir(os.path.join(path, 'refs')):
+        return path
+    while True:
+        dot_git = os.path.join(path, '.git')
+        if os.path.isdir(dot_git):
+            git_dir = dot_git
+            break
+        if os.path.isfile(dot_git):
+            try:
+                with open(dot_git, encoding='utf-8') as f:
+                    content = f.read().strip()
+            except OSError:
+                return None
+            if not content.startswith('gitdir:'):
+                return None
+            git_dir = os.path.normpath(os.path.join(path, content[len('gitdir:'):].strip()))
+            break
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+    commondir = os.path.join(git_dir, 'commondir')
+    if os.path.isfile(commondir):
+        try:
+            with open(commondir, encoding='utf-8') as f:
+                return os.path.normpath(os.path.join(git_dir, f.read().strip()))
+        except OSError:
+            pass
+    return git_dir
+
+
+def packed_refs_state(git_dir):
+    """packed-refs 的 (修改时间, 大小)，文件不存在时为 None"""
+    try:
+        stat = os.stat(os.path.join(git_dir, 'packed-refs'))
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class RefWatcher(QObject):
+    """
+    监视各项目的本地分支变化（新建、删除、重命名分支，git pack-refs 等）。
+
+    QFileSystemWatcher 只监视目录本身的增删，因此监视 refs/heads 及其所有子目录（分支名含 / 时会建子目录），
+    以及仓库目录本身（packed-refs 被整体替换时触发）。仓库目录在 git status、git add 写 index 和锁文件时
+    也会变化，因此只有 packed-refs 的修改时间或大小确实变化时才处理。一次 git 操作会连续触发多次，
+    最后一次变化 DEBOUNCE_MS 毫秒后，每个受影响的项目只发出一次 changed。
+    """
+    changed = Signal(str)  # project
+    DEBOUNCE_MS = 500
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self._on_directory_changed)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.DEBOUNCE_MS)
+        self.timer.timeout.connect(self._emit_pending)
+        self._git_dirs = {}  # project -> 引用目录
+        self._paths = {}  # project -> 监视的目录
+        self._owners = {}  # 目录 -> 监视它的项目（多个项目可以指向同一仓库）
+        self._packed_refs = {}  # 引用目录 -> packed-refs 的状态
+        self._pending = set()
+
+    def watch(self, project_name, repo_path):
+        git_dir = find_git_common_dir(repo_path)
+        if git_dir is None:
+            self.unwatch(project_name)
+            return
+        self._git_dirs[project_name] = git_dir
+        self._update_paths(project_name)
+
+    def unwatch(self, project_name):
+        self._git_dirs.pop(project_name, None)
+        self._pending.discard(project_name)
+        self._set_paths(project_name, set())
+
+    def _update_paths(self, project_name):
+        """重新扫描 refs/heads 下的子目录，新增的目录加入监视，已删除的移除"""
+        git_dir = self._git_dirs[project_name]
+        self._packed_refs[git_dir] = packed_refs_state(git_dir)
+        paths = {git_dir}
+        for root, _, _ in os.walk(os.path.join(git_dir, 'refs', 'heads')):
+            paths.add(root)
+        self._set_paths(project_name, paths)
+
+    def _set_paths(self, project_name, paths):
+        old_paths = self._paths.pop(project_name, set())
+        if paths:
+            self._paths[project_name] = paths
+        for path in paths:
+            self._owners.setdefault(path, set()).add(project_name)
+        released = []
+        for path in old_paths - paths:
+            owners = self._owners.get(path, set())
+            owners.discard(project_name)
+            if not owners:
+                self._owners.pop(path, None)
+                self._packed_refs.pop(path, None)
+                released.append(path)
+
+        # 被删除的目录会自动从 QFileSystemWatcher 中移除，重新创建后需要再次加入
+        watched = set(self.watcher.directories())
+        removed = [path for path in released if path in watched]
+        if removed:
+            self.watcher.removePaths(removed)
+        added = [path for path in paths if path not in watched and os.path.isdir(path)]
+        if added:
+            self.watcher.addPaths(added)
+
+    def _on_directory_changed(self, path):
+        if path in self._packed_refs:
+            state = packed_refs_state(path)
+            if state == self._packed_refs[path]:
+                return
+            self._packed_refs[path] = state
+        for project_name in list(self._owners.get(path, ())):
+            self._pending.add(project_name)
+        if self._pending:
+            self.timer.start()
+
+    def _emit_pending(self):
+        pending, self._pending = self._pending, set()
+        for project_name in pending:
+            if project_name in self._git_dirs:
+                self._update_paths(project_name)
+                self.changed.emit(project_name)
@@ -0,0 +1,26 @@
+from PySide6.QtCore import QObject, Signal, QRunnable
+
+from src.utils.git_log_worker import RefIndex
+
+
+class RefListSignals(QObject):
+    finished = Signal(str, list)  # project, branches
+    error = Signal(str, str)  # project, message
+
+
+class RefListTask(QRunnable):
+    """
+    在后台读取项目的本地分支列表，避免在界面线程中打开仓库。
+    """
+    def __init__(self, project_name, repo_path):
+        super().__init__()
+        self.project_name = project_name
+        self.repo_path = repo_path
+        self.signals = RefListSignals()
+
+    def run(self):
+        try:
+            branches = RefIndex.load(self.repo_path).local_branches()
+            self.signals.finished.emit(self.project_name, branches)
+        except Exception as e:
+            self.signals.error.emit(self.project_name, str(e))
@@ -0,0 +1,99 @@
+import hashlib
+import os
+import sqlite3
+import time
+
+from src.config.config import app_data_dir
+
+
+def normalize_payload(text):
+    """统一换行、去掉行尾空白和空行，避免无关的格式差异导致缓存失效"""
+    lines = (line.rstrip() for line in text.replace('\r\n', '\n').replace('\r', '\n').split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+def summary_key(model, prompt, payload):
+    """按 模型 + 提示词 + 规范化后的提交内容 计算缓存键"""
+    digest = hashlib.sha256()
+    for part in (model, prompt.strip(), normalize_payload(payload)):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class SummaryCache:
+    """
+    以内容哈希为键的 AI 总结缓存。
+
+    同一模型、提示词和提交内容只请求一次，结果保存在配置目录下的 summaries.db 中；
+    整份报告、按开发者生成的各段、分段总结的各段都可以单独命中。
+    写入时淘汰超过 max_age_days 未使用的条目，总大小超过 max_bytes 时从最久未使用的开始删除。
+    只在 GUI 线程中读写。
+    """
+
+    def __init__(self, db_path=None, max_bytes=20 * 1024 * 1024, max_age_days=30):
+        self.db_path = db_path or os.path.join(app_data_dir(), 'summaries.db')
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 24 * 3600
+        self._conn = None
+
+    def connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, timeout=30)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS summaries (
+                    key TEXT PRIMARY KEY,
+                    summary TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created REAL NOT NULL,
+                    last_used REAL NOT NULL
+                ) WITHOUT ROWID
+            ''')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_summaries_last_used ON summaries (last_used)')
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key):
+        """命中时返回总结内容并刷新使用时间，未命中返回 None"""
+        conn = self.connect()
+        row = conn.execute('SELECT summary, last_used FROM summaries WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if now - row[1] > self.max_age:
+            conn.execute('DELETE FROM summaries WHERE key = ?', (key,))
+            conn.commit()
+            return None
+        conn.execute('UPDATE summaries SET last_used = ? WHERE key = ?', (now, key))
+        conn.commit()
+        return row[0]
+
+    def put(self, key, summary):
+        if not summary or not summary.strip():
+            return
+        conn = self.connect()
+        now = time.time()
+        conn.execute('INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?, ?)',
+                     (key, summary, len(summary.encode('utf-8')), now, now))
+        self._evict(conn, now)
+        conn.commit()
+
+    def _evict(self, conn, now):
+        conn.execute('DELETE FROM summaries WHERE last_used < ?', (now - self.max_age,))
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM summaries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # 从最久未使用的条目开始删除，直到总大小回到上限以内
+        expired = []
+        for key, size in conn.execute('SELECT key, size FROM summaries ORDER BY last_used'):
+            if total <= self.max_bytes:
+                break
+            expired.append((key,))
+            total -= size
+        conn.executemany('DELETE FROM summaries WHERE key = ?', expired)
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
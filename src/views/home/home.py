@@ -1,4 +1,3 @@
-import json
 import os.path
 
 import qtmodern6.styles
@@ -6,28 +5,59 @@ import qt_themes
 import pendulum
 
 from src.components.add_account_dialog import AddAccountDialog
+from src.components.commit_table_model import CommitTableModel
 from src.utils.git_log_worker import GitLogManager
+from src.utils.git_fetch_worker import GitFetchManager
+from src.utils.git_ref_worker import RefListTask
+from src.utils.git_ref_watcher import RefWatcher
+from src.utils.repo_scanner import RepoScanTask
+from src.utils.commit_cache import CommitCache
+from src.utils.commit_stats import CommitStats
+from src.utils.summary_cache import SummaryCache, summary_key
+from src.utils.date_range import DATE_OPTIONS, CUSTOM_PERIOD, get_date_range, get_datetime_range, git_time_range
 from src.views.home.ui_home import Ui_Home
 from PySide6.QtWidgets import QWidget, QApplication, QAbstractItemView, QTreeWidgetItem, QFileDialog, QMessageBox, \
-    QMenu, QDialog
-from PySide6.QtCore import Qt, QDate, QThreadPool, QUrl
-from PySide6.QtGui import QAction, QGuiApplication, QDesktopServices
-from git import Repo, InvalidGitRepositoryError, GitCommandError
+    QMenu, QDialog, QHeaderView, QToolButton
+from PySide6.QtCore import Qt, QDate, QThreadPool, QUrl, QTimer
+from PySide6.QtGui import QAction, QGuiApplication, QDesktopServices, QTextCursor
+from git import Repo, InvalidGitRepositoryError
 from src.config.config import Config
+from src.config.workspace import Workspace
 from src.views.settings.settings import Settings
 from src.utils.ai_task import AITask
+from src.utils.ai_payload import build_compact_payload, estimate_tokens, format_commit_log
+from src.utils.ai_report import MapReduceReportManager, PerAuthorReportManager, order_authors, choose_report_mode
 
 
 class Home(QWidget):
+    STATISTICS_HEADERS = ["分组", "提交数", "活跃天数", "新增行数", "删除行数"]
+
     def __init__(self):
         super(Home, self).__init__()
         pendulum.set_locale('zh')
         self.git_log_manager = None
+        self.git_fetch_manager = None
+        self.report_manager = None
+        # 当前 AI 总结（AITask 或报告管理器）；停止后仍可能有请求在线程池中等待返回，
+        # 引用保留到下一次总结开始，避免任务及其信号对象被提前回收
+        self.report_task = None
+        self.report_running = False
+        self.scan_task = None  # 正在进行的目录扫描
         self.ui = Ui_Home()
         self.ui.setupUi(self)
         self.thread_pool = QThreadPool()
         self._date_changing_by_combo = False
         self.grouped_logs = {}
+        self._streaming_key = None  # 收集过程中最后一次输出到日志框的分组
+        self._pending_lines = []  # 等待合并写入日志框的行
+        self._render_timer = QTimer(self)
+        self.commit_model = CommitTableModel(self)
+        self.commit_cache = CommitCache()
+        self._statistics_dirty = False  # 提交记录变化后，统计在切换到统计页时再重新计算
+        self.summary_cache = SummaryCache()
+        # 分支新建、删除后自动刷新项目下的分支节点
+        self.ref_watcher = RefWatcher(self)
+        self.ref_watcher.changed.connect(self.refresh_project_branches)
         self.init_ui()
         self.init_connect()
 
@@ -36,25 +66,34 @@ class Home(QWidget):
         self.ui.hbl_body.setStretch(2, 0)
         self.ui.wgt_right_content.hide()
         self.ui.btn_export.hide()
+        self.ui.btn_stop.hide()
         self.init_theme()
         self.init_project_wgt()
         self.init_account_wgt()
         self.init_date()
+        self.init_commit_table()
+        self.init_statistics_wgt()
         self.ui.pte_commit_log.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        # 日志框只做展示，关闭撤销栈，避免大量文本写入时额外占用内存
+        self.ui.pte_commit_log.setUndoRedoEnabled(False)
+        # 收集过程中的批量结果合并后再写入，每次写入都会触发一次排版
+        self._render_timer.setSingleShot(True)
+        self._render_timer.setInterval(50)
+        self._render_timer.timeout.connect(self.flush_pending_lines)
         # TODO
-        self.ui.btn_statistics.hide()
         self.ui.btn_filter.hide()
-        self.ui.line_2.hide()
 
     def init_connect(self):
         self.ui.btn_homepage.clicked.connect(self.go_homepage)
         self.ui.btn_settings.clicked.connect(self.show_settings)
-        self.ui.btn_statistics.clicked.connect(self.ui.wgt_right_content.show)
+        self.ui.btn_statistics.clicked.connect(self.show_statistics)
+        self.ui.tw_commit_log.currentChanged.connect(self.update_statistics)
         self.ui.cbb_theme.currentTextChanged.connect(self.change_theme)
         self.ui.cbb_date.currentTextChanged.connect(self.change_date)
         self.ui.de_since.dateChanged.connect(self.on_date_edited)
         self.ui.de_until.dateChanged.connect(self.on_date_edited)
         self.ui.btn_get.clicked.connect(self.get_commit_info)
+        self.ui.btn_stop.clicked.connect(self.stop)
         self.ui.btn_ai_report.clicked.connect(self.ai_report)
         self.ui.btn_export.clicked.connect(self.export_report)
         self.ui.btn_project_add.clicked.connect(self.add_project)
@@ -97,29 +136,13 @@ class Home(QWidget):
     def on_project_item_expanded(item: QTreeWidgetItem):
         if item.parent() is not None:
             return
-        project_name = item.text(0)
-        with Config().group("projects"):
-            project_data = Config().get(project_name, "{}")
-            try:
-                project_data = json.loads(project_data)
-            except json.JSONDecodeError:
-                project_data = {}
-            project_data["expanded"] = True
-            Config().set(project_name, json.dumps(project_data))
+        Workspace().set_expanded(item.text(0), True)
 
     @staticmethod
     def on_project_item_collapsed(item: QTreeWidgetItem):
         if item.parent() is not None:
             return
-        project_name = item.text(0)
-        with Config().group("projects"):
-            project_data = Config().get(project_name, "{}")
-            try:
-                project_data = json.loads(project_data)
-            except json.JSONDecodeError:
-                project_data = {}
-            project_data["expanded"] = False
-            Config().set(project_name, json.dumps(project_data))
+        Workspace().set_expanded(item.text(0), False)
 
     @staticmethod
     def on_project_item_changed(item: QTreeWidgetItem):
@@ -132,28 +155,71 @@ class Home(QWidget):
         while project_item.parent() is not None:
             project_item = project_item.parent()
 
-        project_name = project_item.text(0)
-        checked = []
-
-        for i in range(project_item.childCount()):
-            child = project_item.child(i)
-            if child.checkState(0) == Qt.CheckState.Checked:
-                branch_data = child.data(0, Qt.ItemDataRole.UserRole)
-                if branch_data:
-                    # if branch_data["type"] == "remote":
-                    #     checked.append(f"remote/{branch_data['remote']}/{branch_data['name']}")
-                    if branch_data["type"] == "local":
-                        checked.append(f"local/{branch_data['name']}")
-
-        with Config().group("projects"):
-            project_data = Config().get(project_name, "{}")
-            try:
-                project_data = json.loads(project_data)
-            except json.JSONDecodeError:
-                project_data = {}
+        # 只更新发生变化的分支；勾选项目节点时 Qt 会为每个分支分别触发一次
+        branch_data = item.data(0, Qt.ItemDataRole.UserRole)
+        if branch_data and branch_data["type"] == "local":
+            Workspace().set_branch_checked(project_item.text(0), f"local/{branch_data['name']}",
+                                           item.checkState(0) == Qt.CheckState.Checked)
+
+    def init_commit_table(self):
+        """提交记录表格：按需加载行，固定行高，避免视图为所有行计算尺寸"""
+        view = self.ui.tv_commit_log
+        view.setModel(self.commit_model)
+        view.setSortingEnabled(True)
+        view.sortByColumn(-1, Qt.SortOrder.AscendingOrder)
+        view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        view.setWordWrap(False)
+        view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        view.verticalHeader().setDefaultSectionSize(view.fontMetrics().height() + 6)
+        view.verticalHeader().hide()
+        header = view.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.setStretchLastSection(True)
+
+    def init_statistics_wgt(self):
+        tree = self.ui.twgt_statistics
+        tree.setColumnCount(len(self.STATISTICS_HEADERS))
+        tree.setHeaderLabels(self.STATISTICS_HEADERS)
+        tree.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        tree.setUniformRowHeights(True)
+        tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        tree.header().setStretchLastSection(False)
+
+    def show_statistics(self):
+        self.ui.tw_commit_log.setCurrentWidget(self.ui.tab_statistics)
+        self.update_statistics()
+
+    def update_statistics(self):
+        """统计页可见且提交记录有变化时重新计算并显示"""
+        if not self._statistics_dirty or self.ui.tw_commit_log.currentWidget() is not self.ui.tab_statistics:
+            return
+        self._statistics_dirty = False
+        tree = self.ui.twgt_statistics
+        tree.clear()
+        if not self.grouped_logs:
+            return
+        stats = CommitStats(self.grouped_logs)
+        tree.addTopLevelItem(self._create_statistics_item(stats.total))
+        for title, rows, expanded in (
+            ("开发者", stats.by_author, True),
+            ("项目", stats.by_project, True),
+            ("日期", stats.by_day, False),
+        ):
+            section = QTreeWidgetItem([f"{title}（{len(rows)}）"])
+            section.addChildren([self._create_statistics_item(row) for row in rows])
+            tree.addTopLevelItem(section)
+            section.setExpanded(expanded)
+        for column in range(1, len(self.STATISTICS_HEADERS)):
+            tree.resizeColumnToContents(column)
 
-            project_data["checked"] = checked
-            Config().set(project_name, json.dumps(project_data))
+    @staticmethod
+    def _create_statistics_item(row):
+        item = QTreeWidgetItem([str(row.name), str(row.commits), str(row.active_days), f"+{row.added}",
+                                f"-{row.removed}"])
+        for column in range(1, 5):
+            item.setTextAlignment(column, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        return item
 
     def init_project_wgt(self):
         """
@@ -174,21 +240,25 @@ class Home(QWidget):
         # 右键菜单
         self.ui.twgt_project.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.ui.twgt_project.customContextMenuRequested.connect(self.show_project_context_menu)
+        # 添加按钮的下拉菜单：单个添加或扫描目录批量添加
+        add_menu = QMenu(self)
+        add_menu.addAction("添加项目", self.add_project)
+        add_menu.addAction("扫描目录批量添加", self.scan_projects)
+        self.ui.btn_project_add.setMenu(add_menu)
+        self.ui.btn_project_add.setPopupMode(QToolButton.ToolButtonPopupMode.MenuButtonPopup)
         # 加载历史项目
         self.load_projects_to_tree()
 
     def show_project_context_menu(self, pos):
         item = self.ui.twgt_project.itemAt(pos)
-        if not item:
-            return
 
         # 只允许顶层项目节点可以删除（即没有父节点）
-        if item.parent() is not None:
+        if item is not None and item.parent() is not None:
             return
 
         menu = QMenu(self)
         # 检查是否是顶层项目节点
-        if item.parent() is None:
+        if item is not None:
             # 项目节点右键菜单：可以添加删除项目或者 fetch 所有远程的选项
             delete_action = QAction("删除项目", self)
             delete_action.triggered.connect(lambda: self.remove_project(item))
@@ -197,6 +267,10 @@ class Home(QWidget):
             fetch_all_remotes_action = QAction("获取所有远程更新", self)
             fetch_all_remotes_action.triggered.connect(lambda: self.fetch_project_all_remotes(item))
             menu.addAction(fetch_all_remotes_action)
+
+        fetch_all_projects_action = QAction("获取所有项目远程更新", self)
+        fetch_all_projects_action.triggered.connect(self.fetch_all_projects_remotes)
+        menu.addAction(fetch_all_projects_action)
         menu.exec_(self.ui.twgt_project.viewport().mapToGlobal(pos))
 
     def fetch_project_all_remotes(self, project_item: QTreeWidgetItem):
@@ -204,32 +278,59 @@ class Home(QWidget):
         获取整个项目所有远程仓库的最新提交。
         """
         project_name = project_item.text(0)
-        with Config().group("projects"):
-            project_data_str = Config().get(project_name, "{}")
-            try:
-                project_config = json.loads(project_data_str)
-                repo_path = project_config.get('path')
-            except json.JSONDecodeError:
-                QMessageBox.critical(self, "错误", f"无法解析项目 [{project_name}] 的配置。")
-                return
-
+        repo_path = project_item.data(0, Qt.ItemDataRole.UserRole)
         if not repo_path or not os.path.isdir(repo_path):
             QMessageBox.critical(self, "错误", f"项目 [{project_name}] 路径无效或不存在。")
             return
+        self.start_fetch({project_name: repo_path})
 
-        try:
-            repo = Repo(repo_path)
-            for remote in repo.remotes:
-                remote.fetch()  # fetch 所有远程
+    def fetch_all_projects_remotes(self):
+        """
+        获取所有项目所有远程仓库的最新提交。
+        """
+        project_paths = {}
+        for i in range(self.ui.twgt_project.topLevelItemCount()):
+            project_item = self.ui.twgt_project.topLevelItem(i)
+            repo_path = project_item.data(0, Qt.ItemDataRole.UserRole)
+            if repo_path and os.path.isdir(repo_path):
+                project_paths[project_item.text(0)] = repo_path
+        if not project_paths:
+            QMessageBox.warning(self, "错误", "没有可更新的项目！")
+            return
+        self.start_fetch(project_paths)
 
-            QMessageBox.information(self, "更新成功", f"项目 [{project_name}] 已成功获取所有远程的最新提交。")
+    def start_fetch(self, project_paths):
+        """在后台线程池中并发拉取远程仓库，不阻塞界面"""
+        if self.git_fetch_manager is not None and self.git_fetch_manager.is_running():
+            QMessageBox.warning(self, "错误", "正在获取远程更新，请稍候！")
+            return
 
-        except InvalidGitRepositoryError:
-            QMessageBox.critical(self, "错误", f"路径 [{repo_path}] 不是一个有效的 Git 仓库。")
-        except GitCommandError as e:
-            QMessageBox.critical(self, "Git 错误", f"执行 Git Fetch 失败：\n{e.stderr.strip()}")
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"获取项目 [{project_name}] 更新失败：{e}")
+        max_threads = int(Config().get('settings/fetch_threads', 4))
+        self.git_fetch_manager = GitFetchManager(max_threads=max_threads)
+        self.git_fetch_manager.progress.connect(self.on_progress)
+        self.git_fetch_manager.remote_finished.connect(self.on_fetch_remote_finished)
+        self.git_fetch_manager.finished.connect(self.on_fetch_finished)
+        self.ui.progress.setValue(0)
+        self.git_fetch_manager.start(project_paths)
+
+    def on_fetch_remote_finished(self, project, remote, success, message):
+        state = "完成" if success else "失败"
+        self.ui.progress.setFormat(f"%p% {project}/{remote} {state}")
+
+    def on_fetch_finished(self, results):
+        self.ui.progress.setFormat("%p%")
+        failed = [result for result in results if not result[2]]
+        if not failed:
+            QMessageBox.information(self, "更新成功", f"已成功获取 {len(results)} 个远程仓库的最新提交。")
+            return
+
+        details = "\n".join(
+            f"[{project}{'/' + remote if remote else ''}] {message}" for project, remote, _, message in failed
+        )
+        QMessageBox.warning(
+            self, "更新完成",
+            f"成功 {len(results) - len(failed)} 个，失败 {len(failed)} 个：\n{details}"
+        )
 
     def remove_project(self, item):
         project_name = item.text(0)
@@ -242,8 +343,8 @@ class Home(QWidget):
             return
 
         # 从配置中删除
-        with Config().group("projects"):
-            Config().remove(project_name)
+        Workspace().remove_project(project_name)
+        self.ref_watcher.unwatch(project_name)
 
         # 从界面中删除
         index = self.ui.twgt_project.indexOfTopLevelItem(item)
@@ -251,28 +352,79 @@ class Home(QWidget):
             self.ui.twgt_project.takeTopLevelItem(index)
 
     def load_projects_to_tree(self):
-        config = Config()
-        with config.group('projects'):
-            for project_name in config.child_keys():
-                try:
-                    project_json = config.get(project_name, "")
-                    if not project_json:
-                        continue
+        """
+        先根据配置立即显示项目节点（以及上次缓存的分支），再在后台刷新各项目的分支列表。
+        """
+        for project in Workspace().projects():
+            try:
+                if not os.path.exists(project.path):
+                    continue
+
+                project_item = self.add_project_to_tree(project.name)
+                project_item.setData(0, Qt.ItemDataRole.UserRole, project.path)
+                self._add_branch_items(project_item, project.branches, project.checked)
+
+                project_item.setExpanded(project.expanded)
+                self.load_project_branches(project_item)
+                self.ref_watcher.watch(project.name, project.path)
+            except Exception as e:
+                print(f"加载项目失败 [{project.name}]：{e}")
+
+    def load_project_branches(self, project_item: QTreeWidgetItem):
+        """在后台线程读取分支列表，完成后由 on_project_branches_loaded 更新子节点"""
+        task = RefListTask(project_item.text(0), project_item.data(0, Qt.ItemDataRole.UserRole))
+        task.signals.finished.connect(self.on_project_branches_loaded)
+        task.signals.error.connect(self.on_project_branches_error)
+        self.thread_pool.start(task)
 
-                    project_data = json.loads(project_json)
-                    folder_path = project_data.get('path', '')
-                    checked = set(project_data.get('checked', []))
+    def refresh_project_branches(self, project_name):
+        """仓库的分支发生变化时重新读取分支列表，由 on_project_branches_loaded 增量更新并保留勾选状态"""
+        project_item = self.find_project_item(project_name)
+        if project_item is not None:
+            self.load_project_branches(project_item)
+
+    def find_project_item(self, project_name):
+        for i in range(self.ui.twgt_project.topLevelItemCount()):
+            item = self.ui.twgt_project.topLevelItem(i)
+            if item.text(0) == project_name:
+                return item
+        return None
+
+    def on_project_branches_loaded(self, project_name, branches):
+        project_item = self.find_project_item(project_name)
+        if project_item is None:
+            return  # 加载期间项目已被删除
+
+        project = Workspace().project(project_name)
+        if project is None:
+            return
 
-                    if not os.path.exists(folder_path):
-                        continue
+        # 只增删发生变化的分支节点，保留已有节点的勾选状态；批量修改期间不触发 itemChanged
+        tree = self.ui.twgt_project
+        tree.blockSignals(True)
+        try:
+            existing = {}
+            for i in reversed(range(project_item.childCount())):
+                child = project_item.child(i)
+                if child.text(0) in branches:
+                    existing[child.text(0)] = child
+                else:
+                    project_item.removeChild(child)
+            for index, branch in enumerate(branches):
+                if branch not in existing:
+                    item = self._create_branch_item(branch, f"local/{branch}" in project.checked)
+                    project_item.insertChild(index, item)
+            project_item.setExpanded(project.expanded)
+        finally:
+            tree.blockSignals(False)
 
-                    project_item = self.add_project_to_tree(project_name)
-                    project_item.setData(0, Qt.ItemDataRole.UserRole, folder_path)
-                    self._add_branch_items(project_item, Repo(folder_path), checked)
+        # 缓存分支列表，下次启动时直接显示
+        if project.branches != branches:
+            Workspace().set_branches(project_name, branches)
 
-                    project_item.setExpanded(project_data.get("expanded", True))
-                except Exception as e:
-                    print(f"加载项目失败 [{project_name}]：{e}")
+    @staticmethod
+    def on_project_branches_error(project_name, message):
+        print(f"加载项目分支失败 [{project_name}]：{message}")
 
     def add_project_to_tree(self, name):
         item = QTreeWidgetItem(self.ui.twgt_project)
@@ -284,19 +436,23 @@ class Home(QWidget):
         return item
 
     @staticmethod
-    def _add_branch_items(project_item, repo, checked_set=None):
+    def _create_branch_item(branch, checked=False):
+        item = QTreeWidgetItem()
+        item.setText(0, branch)
+        item.setData(0, Qt.ItemDataRole.UserRole, {
+            "type": "local",
+            "name": branch
+        })
+        item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+        item.setCheckState(0, Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked)
+        return item
+
+    def _add_branch_items(self, project_item, branches, checked_set=None):
         if checked_set is None:
             checked_set = set()
-        for branch in repo.branches:
-            full_name = f"local/{branch.name}"
-            item = QTreeWidgetItem(project_item)
-            item.setText(0, branch.name)
-            item.setData(0, Qt.ItemDataRole.UserRole, {
-                "type": "local",
-                "name": branch.name
-            })
-            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-            item.setCheckState(0, Qt.CheckState.Checked if full_name in checked_set else Qt.CheckState.Unchecked)
+        project_item.addChildren([
+            self._create_branch_item(branch, f"local/{branch}" in checked_set) for branch in branches
+        ])
 
     def add_project(self):
         last_dir = Config().get('settings/last_dir', os.path.expanduser('~'))
@@ -306,24 +462,96 @@ class Home(QWidget):
             return
         try:
             Config().set('settings/last_dir', folder_path)
-            repo = Repo(folder_path, search_parent_directories=True)
+            Repo(folder_path, search_parent_directories=True)
             project_name = os.path.basename(folder_path.rstrip(os.sep))
             project_item = self.add_project_to_tree(project_name)
             project_item.setData(0, Qt.ItemDataRole.UserRole, folder_path)
-            self._add_branch_items(project_item, repo, checked_set=set())
             project_item.setExpanded(True)
 
-            project_data = {
-                'path': folder_path,
-                'checked': []
-            }
-            Config().set(f"projects/{project_name}", json.dumps(project_data))
+            Workspace().add_project(project_name, folder_path)
+            self.load_project_branches(project_item)
+            self.ref_watcher.watch(project_name, folder_path)
 
         except InvalidGitRepositoryError:
             QMessageBox.critical(self, "错误", "请选择有效的 Git 项目目录！")
         except Exception as e:
             QMessageBox.critical(self, "错误", str(e))
 
+    def scan_projects(self):
+        """选择一个目录，在后台扫描其中的所有 Git 仓库，完成后批量添加为项目"""
+        if self.scan_task is not None:
+            QMessageBox.warning(self, "错误", "正在扫描目录，请稍候！")
+            return
+        last_dir = Config().get('settings/last_dir', os.path.expanduser('~'))
+        root = QFileDialog.getExistingDirectory(self, '选择要扫描的目录', last_dir, QFileDialog.Option.ShowDirsOnly)
+        if not root:
+            return
+        Config().set('settings/last_dir', root)
+        self.scan_task = RepoScanTask(root)
+        self.scan_task.signals.progress.connect(self.on_scan_progress)
+        self.scan_task.signals.finished.connect(self.on_scan_finished)
+        self.scan_task.signals.error.connect(self.on_scan_error)
+        self.ui.progress.setFormat("正在扫描目录...")
+        self.thread_pool.start(self.scan_task)
+
+    def on_scan_progress(self, scanned, found):
+        self.ui.progress.setFormat(f"已扫描 {scanned} 个目录，找到 {found} 个仓库")
+
+    def on_scan_finished(self, repos):
+        root = self.scan_task.root
+        self.scan_task = None
+        self.ui.progress.setFormat("%p%")
+
+        tree = self.ui.twgt_project
+        names = set()
+        paths = set()
+        for i in range(tree.topLevelItemCount()):
+            item = tree.topLevelItem(i)
+            names.add(item.text(0))
+            paths.add(os.path.normcase(os.path.abspath(item.data(0, Qt.ItemDataRole.UserRole) or '')))
+
+        new_projects = []
+        for repo_path in repos:
+            if os.path.normcase(os.path.abspath(repo_path)) in paths:
+                continue  # 已经导入过
+            name = self._unique_project_name(repo_path, root, names)
+            names.add(name)
+            new_projects.append((name, repo_path))
+
+        if new_projects:
+            # 一次事务写入所有项目；数量较多时默认折叠
+            Workspace().add_projects(new_projects, expanded=False)
+            tree.setUpdatesEnabled(False)
+            try:
+                for name, repo_path in new_projects:
+                    project_item = self.add_project_to_tree(name)
+                    project_item.setData(0, Qt.ItemDataRole.UserRole, repo_path)
+                    project_item.setExpanded(False)
+                    self.load_project_branches(project_item)
+                    self.ref_watcher.watch(name, repo_path)
+            finally:
+                tree.setUpdatesEnabled(True)
+
+        QMessageBox.information(self, "扫描完成", f"找到 {len(repos)} 个仓库，新增 {len(new_projects)} 个项目。")
+
+    def on_scan_error(self, message):
+        self.scan_task = None
+        self.ui.progress.setFormat("%p%")
+        QMessageBox.warning(self, "错误", f"扫描目录失败：{message}")
+
+    @staticmethod
+    def _unique_project_name(repo_path, root, names):
+        """默认使用目录名；重名时改用相对扫描目录的路径，仍然重名时追加序号"""
+        name = os.path.basename(repo_path.rstrip(os.sep))
+        if name in names:
+            relative = os.path.relpath(repo_path, os.path.dirname(root.rstrip(os.sep)))
+            name = relative.replace(os.sep, '/')
+        base, index = name, 2
+        while name in names:
+            name = f"{base} ({index})"
+            index += 1
+        return name
+
     def init_account_wgt(self):
         self.ui.twgt_account.setColumnCount(2)
         self.ui.twgt_account.setRootIsDecorated(False)
@@ -345,7 +573,7 @@ class Home(QWidget):
         menu.exec_(self.ui.twgt_account.viewport().mapToGlobal(pos))
 
     def remove_account(self, item: QTreeWidgetItem):
-        """删除账号（JSON格式）"""
+        """删除账号"""
         name = item.text(0)
         reply = QMessageBox.question(
             self, "确认删除",
@@ -356,19 +584,13 @@ class Home(QWidget):
             return
 
         # 从配置中删除
-        with Config().group("accounts"):
-            accounts_json = Config().get("account_list", "{}")
-            accounts = json.loads(accounts_json) if accounts_json else {}
-
-            if name in accounts:
-                del accounts[name]
-                Config().set("account_list", json.dumps(accounts, ensure_ascii=False))
+        Workspace().remove_account(name)
 
         # 从UI中删除
         self.ui.twgt_account.takeTopLevelItem(self.ui.twgt_account.indexOfTopLevelItem(item))
 
     def add_account(self):
-        """添加新账号（保存为JSON格式）"""
+        """添加新账号"""
         dialog = AddAccountDialog(self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             name, email = dialog.get_account_info()
@@ -379,175 +601,47 @@ class Home(QWidget):
             item.setCheckState(0, Qt.CheckState.Unchecked)  # 默认不勾选
             self.ui.twgt_account.addTopLevelItem(item)
 
-            # 读取现有账号
-            with Config().group("accounts"):
-                accounts_json = Config().get("account_list", "{}")
-                accounts = json.loads(accounts_json) if accounts_json else {}
-
-                # 添加新账号（保留大小写）
-                accounts[name] = {
-                    "email": email,
-                    "checked": False  # 默认未选中
-                }
-
-                # 保存回配置文件
-                Config().set("account_list", json.dumps(accounts, ensure_ascii=False))
+            # 保存账号（保留大小写，默认未选中）
+            Workspace().add_account(name, email)
 
     def load_accounts(self):
-        """从配置文件加载所有账号（JSON格式）"""
+        """加载所有账号"""
         self.ui.twgt_account.clear()
-        with Config().group("accounts"):
-            # 读取JSON格式的账号列表
-            accounts_json = Config().get("account_list", "{}")
-            try:
-                accounts = json.loads(accounts_json)
-            except json.JSONDecodeError:
-                accounts = {}
-
-            # 加载到UI
-            for name, data in accounts.items():
-                item = QTreeWidgetItem([name, data["email"]])
-                item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-                item.setCheckState(0, Qt.CheckState.Checked if data.get("checked", False) else Qt.CheckState.Unchecked)
-                self.ui.twgt_account.addTopLevelItem(item)
+        for account in Workspace().accounts():
+            item = QTreeWidgetItem([account.name, account.email])
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(0, Qt.CheckState.Checked if account.checked else Qt.CheckState.Unchecked)
+            self.ui.twgt_account.addTopLevelItem(item)
 
     @staticmethod
     def on_account_item_changed(item: QTreeWidgetItem):
         """账号勾选状态变化时更新配置"""
-        name = item.text(0)
-        email = item.text(1)
-        checked = item.checkState(0) == Qt.CheckState.Checked
-
-        with Config().group("accounts"):
-            accounts_json = Config().get("account_list", "{}")
-            accounts = json.loads(accounts_json) if accounts_json else {}
-
-            if name in accounts:
-                accounts[name]["checked"] = checked
-                Config().set("account_list", json.dumps(accounts, ensure_ascii=False))
+        Workspace().set_account_checked(item.text(0), item.checkState(0) == Qt.CheckState.Checked)
 
     def init_date(self):
-        date_options = [
-            '今日', '昨日', '本周', '上周',
-            '本月', '上个月', '本季度', '上季度',
-            '上半年', '下半年', '今年', '自定义'
-        ]
-        self.ui.cbb_date.addItems(date_options)
+        self.ui.cbb_date.addItems(DATE_OPTIONS)
         today = pendulum.today()
         self.ui.de_since.setDate(today)
         self.ui.de_until.setDate(today)
 
     @staticmethod
     def get_date_range(text: str) -> tuple[QDate, QDate]:
-        now = pendulum.today()
-        match text:
-            case '今日':
-                start = now.start_of('day')
-                end = now.end_of('day')
-            case '昨日':
-                yesterday = now.subtract(days=1)
-                start = yesterday.start_of('day')
-                end = yesterday.end_of('day')
-            case '本周':
-                start = now.start_of('week')
-                end = now.end_of('week')
-            case '上周':
-                last_week = now.subtract(weeks=1)
-                start = last_week.start_of('week')
-                end = last_week.end_of('week')
-            case '本月':
-                start = now.start_of('month')
-                end = now.end_of('month')
-            case '上个月':
-                last_month = now.subtract(months=1)
-                start = last_month.start_of('month')
-                end = last_month.end_of('month')
-            case '本季度':
-                quarter = (now.month - 1) // 3 + 1
-                start = pendulum.datetime(now.year, 3 * (quarter - 1) + 1, 1)
-                end = start.add(months=3).subtract(days=1)
-            case '上季度':
-                quarter = (now.month - 1) // 3
-                if quarter == 0:
-                    start = pendulum.datetime(now.year - 1, 10, 1)
-                else:
-                    start = pendulum.datetime(now.year, 3 * (quarter - 1) + 1, 1)
-                end = start.add(months=3).subtract(days=1)
-            case '上半年':
-                start = pendulum.datetime(now.year, 1, 1)
-                end = pendulum.datetime(now.year, 6, 30)
-            case '下半年':
-                start = pendulum.datetime(now.year, 7, 1)
-                end = pendulum.datetime(now.year, 12, 31)
-            case '今年':
-                start = now.start_of('year')
-                end = now.end_of('year')
-            case _:
-                start = end = now
-
+        start, end = get_date_range(text)
         return QDate(start.year, start.month, start.day), QDate(end.year, end.month, end.day)
 
     @staticmethod
     def get_datetime_range(text: str) -> tuple[str, str]:
         """返回用于 git log 的日期时间字符串格式"""
-        now = pendulum.today()
-        match text:
-            case '今日':
-                start = now.start_of('day')
-                end = now.end_of('day')
-            case '昨日':
-                yesterday = now.subtract(days=1)
-                start = yesterday.start_of('day')
-                end = yesterday.end_of('day')
-            case '本周':
-                start = now.start_of('week')
-                end = now.end_of('week')
-            case '上周':
-                last_week = now.subtract(weeks=1)
-                start = last_week.start_of('week')
-                end = last_week.end_of('week')
-            case '本月':
-                start = now.start_of('month')
-                end = now.end_of('month')
-            case '上个月':
-                last_month = now.subtract(months=1)
-                start = last_month.start_of('month')
-                end = last_month.end_of('month')
-            case '本季度':
-                quarter = (now.month - 1) // 3 + 1
-                start = pendulum.datetime(now.year, 3 * (quarter - 1) + 1, 1).start_of('day')
-                end = start.add(months=3).subtract(days=1).end_of('day')
-            case '上季度':
-                quarter = (now.month - 1) // 3
-                if quarter == 0:
-                    start = pendulum.datetime(now.year - 1, 10, 1).start_of('day')
-                else:
-                    start = pendulum.datetime(now.year, 3 * (quarter - 1) + 1, 1).start_of('day')
-                end = start.add(months=3).subtract(days=1).end_of('day')
-            case '上半年':
-                start = pendulum.datetime(now.year, 1, 1).start_of('day')
-                end = pendulum.datetime(now.year, 6, 30).end_of('day')
-            case '下半年':
-                start = pendulum.datetime(now.year, 7, 1).start_of('day')
-                end = pendulum.datetime(now.year, 12, 31).end_of('day')
-            case '今年':
-                start = now.start_of('year')
-                end = now.end_of('year')
-            case _:
-                start = now.start_of('day')
-                end = now.end_of('day')
-
-        # 返回 ISO 格式的日期时间字符串，git log 可以直接使用
-        return start.to_iso8601_string(), end.to_iso8601_string()
+        return get_datetime_range(text)
 
     def on_date_edited(self):
-        if not self._date_changing_by_combo and self.ui.cbb_date.currentText() != "自定义":
-            self.ui.cbb_date.setCurrentText("自定义")
+        if not self._date_changing_by_combo and self.ui.cbb_date.currentText() != CUSTOM_PERIOD:
+            self.ui.cbb_date.setCurrentText(CUSTOM_PERIOD)
 
     def change_date(self, text: str):
         self._date_changing_by_combo = True  # 设置标志
         try:
-            if text != "自定义":
+            if text != CUSTOM_PERIOD:
                 start, end = self.get_date_range(text)
                 self.ui.de_since.setDate(start)
                 self.ui.de_until.setDate(end)
@@ -555,12 +649,13 @@ class Home(QWidget):
             self._date_changing_by_combo = False  # 清除标志
 
     def get_commit_info_account(self):
-        """获取选中的账号（从JSON加载的账号）"""
-        selected_authors = set()
+        """获取选中的账号"""
+        # 保持账号列表中的顺序，按开发者生成报告时以此排序
+        selected_authors = []
         for i in range(self.ui.twgt_account.topLevelItemCount()):
             item = self.ui.twgt_account.topLevelItem(i)
             if item.checkState(0) == Qt.CheckState.Checked:
-                selected_authors.add(item.text(0))
+                selected_authors.append(item.text(0))
         return selected_authors
 
     def get_commit_info_project_branch(self):
@@ -607,30 +702,52 @@ class Home(QWidget):
             return
 
         self.grouped_logs.clear()
-        since_date = self.ui.de_since.date()
-        until_date = self.ui.de_until.date()
-
-        # 转换为 pendulum 日期对象并设置时间
-        since = pendulum.datetime(
-            since_date.year(), since_date.month(), since_date.day(),
-            0, 0, 0  # 00:00:00
-        )
-        until = pendulum.datetime(
-            until_date.year(), until_date.month(), until_date.day(),
-            23, 59, 59  # 23:59:59
-        )
-        self.git_log_manager = GitLogManager(max_threads=4)
-        self.git_log_manager.log_collected.connect(self.on_log_collected)
-        self.git_log_manager.error.connect(self.on_log_error)
-        self.git_log_manager.progress.connect(self.on_progress)
-        self.git_log_manager.finished.connect(self.on_all_finished)
-        self.git_log_manager.start(project_map, selected_authors, since.to_iso8601_string(), until.to_iso8601_string())
+        self._streaming_key = None
+        self._pending_lines.clear()
+        self._render_timer.stop()
+        self.ui.pte_commit_log.clear()
+        self.commit_model.clear()
+        self.ui.twgt_statistics.clear()
+        since, until = git_time_range(self.ui.de_since.date().toPython(), self.ui.de_until.date().toPython())
+        # 线程数上限为 0 时按 CPU 核数自动决定，实际并发由管理器按任务耗时调整
+        max_threads = int(Config().get('settings/git_threads', 0))
+        if self.git_log_manager is None:
+            self.git_log_manager = GitLogManager(max_threads=max_threads, commit_cache=self.commit_cache)
+            self.git_log_manager.log_collected.connect(self.on_log_collected)
+            self.git_log_manager.error.connect(self.on_log_error)
+            self.git_log_manager.progress.connect(self.on_progress)
+            self.git_log_manager.finished.connect(self.on_all_finished)
+            self.git_log_manager.cancelled.connect(self.on_collect_cancelled)
+            # 退出时结束后台补全提交缓存的 git 进程
+            QApplication.instance().aboutToQuit.connect(self.git_log_manager.shutdown)
+        self.git_log_manager.set_max_threads(max_threads)
+        # 上一次收集尚未结束时由 start 先停止，旧任务的结果不会混入本次
+        self.git_log_manager.start(project_map, selected_authors, since, until)
+        self.ui.progress.setFormat("%p%")
+        self.update_stop_button()
 
     def on_log_collected(self, project, branch, author, logs):
         key = (project, branch, author)
         if key not in self.grouped_logs:
             self.grouped_logs[key] = []
         self.grouped_logs[key].extend(logs)
+        self.commit_model.append_logs(logs)
+
+        # 收集过程中先按到达顺序显示，全部完成后由 on_all_finished 按分组重新整理
+        if not logs:
+            return
+        if key != self._streaming_key:
+            self._streaming_key = key
+            self._pending_lines.append(f"【项目】{project}\n【分支】{branch}\n【账号】{author}")
+        self._pending_lines.extend(f"{log.date} {log.message}" for log in logs)
+        if not self._render_timer.isActive():
+            self._render_timer.start()
+
+    def flush_pending_lines(self):
+        """把合并后的批量结果一次性追加到日志框"""
+        if self._pending_lines:
+            self.ui.pte_commit_log.appendPlainText("\n".join(self._pending_lines))
+            self._pending_lines.clear()
 
     def on_log_error(self, message):
         QMessageBox.warning(
@@ -644,38 +761,87 @@ class Home(QWidget):
         self.ui.progress.setValue(percentage)
 
     def on_all_finished(self):
-        self.ui.pte_commit_log.clear()
-        unique_commits = set()
-        # 遍历每个项目分支账号组，先写标题，再写去重后的日志
-        for (project, branch, author), logs in self.grouped_logs.items():
-            self.ui.pte_commit_log.appendPlainText(f"【项目】{project}\n【分支】{branch}\n【账号】{author}")
-
-            # 当前组去重
-            unique_logs = []
-            for log in logs:
-                if log["commit"] not in unique_commits:
-                    unique_commits.add(log["commit"])
-                    unique_logs.append(log)
-
-            for log in unique_logs:
-                self.ui.pte_commit_log.appendPlainText(f"{log['date']} {log['message']}")
-            self.ui.pte_commit_log.appendPlainText("")
+        self.update_stop_button()
+        self._render_timer.stop()
+        self._pending_lines.clear()
+        self.commit_model.set_logs(self.grouped_logs)
+        self._statistics_dirty = True
+        self.update_statistics()
+        # 整体一次写入，避免逐行 appendPlainText 反复触发排版
+        self.ui.pte_commit_log.setPlainText(self.build_commit_log_text())
+
+    def on_collect_cancelled(self):
+        """停止收集后按已收到的部分整理显示"""
+        self.on_all_finished()
+        self.ui.progress.setFormat("已停止")
+
+    def stop(self):
+        """停止正在进行的收集和 AI 总结"""
+        if self.git_log_manager is not None:
+            self.git_log_manager.cancel()
+        if self.report_running:
+            self.report_task.cancel()
+            self.report_running = False
+            self.ui.btn_ai_report.setText("AI 总结")
+            self.ui.btn_ai_report.setEnabled(True)
+            self.ui.progress.setFormat("已停止")
+        self.update_stop_button()
+
+    def update_stop_button(self):
+        collecting = self.git_log_manager is not None and self.git_log_manager.is_running()
+        self.ui.btn_stop.setVisible(collecting or self.report_running)
+
+    def build_commit_log_text(self):
+        """把分组后的提交记录整理为纯文本，用于文本视图和 AI 总结"""
+        return format_commit_log(self.grouped_logs)
 
     @staticmethod
     def show_settings():
         settings = Settings()
         settings.exec()
 
-    def handle_success(self, msg):
-        print("总结成功")
+    def show_ai_report_panel(self):
         self.ui.hbl_body.setStretch(2, 4)
         self.ui.wgt_right_content.show()
+
+    def handle_chunk(self, text):
+        """流式输出：收到的内容直接追加到报告末尾"""
+        if not self.report_running:  # 已停止
+            return
+        self.show_ai_report_panel()
+        cursor = self.ui.pte_ai_report.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText(text)
+
+    def handle_partial(self, text):
+        """按开发者生成时，每完成一个开发者整体刷新一次报告"""
+        if not self.report_running:
+            return
+        self.show_ai_report_panel()
+        self.ui.pte_ai_report.setPlainText(text)
+
+    def handle_success(self, msg):
+        if not self.report_running:
+            return
+        self.report_running = False
+        self.show_report(msg)
+
+    def show_report(self, msg):
+        print("总结成功")
+        self.update_stop_button()
+        self.show_ai_report_panel()
         self.ui.btn_export.show()
-        self.ui.pte_ai_report.setPlainText(msg)
+        # 流式输出时内容已经逐段追加完毕，避免重设文本导致滚动位置跳动
+        if self.ui.pte_ai_report.toPlainText() != msg:
+            self.ui.pte_ai_report.setPlainText(msg)
         self.ui.btn_ai_report.setText("AI 总结")
         self.ui.btn_ai_report.setEnabled(True)
 
     def handle_error(self, msg):
+        if not self.report_running:
+            return
+        self.report_running = False
+        self.update_stop_button()
         self.ui.btn_ai_report.setText("AI 总结")
         self.ui.btn_ai_report.setEnabled(True)
         QMessageBox.critical(self, '错误', f"总结失败：\n{msg}")
@@ -701,22 +867,92 @@ class Home(QWidget):
             )
             return
 
-        git_log = self.ui.pte_commit_log.toPlainText()
-        self.ui.btn_ai_report.setText("生成中...")
+        # 发送给模型的是精简后的记录，发送前给出 token 估算
+        git_log = build_compact_payload(self.grouped_logs)
+        tokens = estimate_tokens(prompt) + estimate_tokens(git_log)
+        self.ui.btn_ai_report.setText(f"生成中（约 {tokens} tokens）...")
         self.ui.btn_ai_report.setEnabled(False)
         self.ui.pte_ai_report.clear()
 
+        # 按开发者并行生成：每个开发者单独请求，结果按账号列表顺序汇总
+        # 已收集的记录以收集时的账号为准，先按账号列表排序，当前未勾选的账号排在最后
+        authors = order_authors(self.grouped_logs, self.get_commit_info_account())
+        max_context_tokens = int(Config().get('settings/max_context_tokens', 24000))
+        mode = choose_report_mode(Config().get('settings/report_mode', 'single'), len(authors), tokens,
+                                  max_context_tokens)
+        if mode == 'per_author':
+            self.report_manager = PerAuthorReportManager(
+                api_key,
+                api_url,
+                api_model,
+                prompt,
+                max_threads=int(Config().get('settings/ai_threads', 4)),
+                summary_cache=self.summary_cache,
+                max_context_tokens=max_context_tokens
+            )
+            self.report_manager.progress.connect(self.on_author_report_progress)
+            self.report_manager.partial.connect(self.handle_partial)
+            self.report_manager.success.connect(self.handle_success)
+            self.report_manager.error.connect(self.handle_error)
+            self.start_report_task(self.report_manager)
+            self.report_manager.start(self.grouped_logs, authors)
+            return
+
+        # 超过模型上下文时改为分段总结再汇总
+        if mode == 'map_reduce':
+            self.report_manager = MapReduceReportManager(
+                api_key,
+                api_url,
+                api_model,
+                prompt,
+                max_chunk_tokens=max_context_tokens // 4,
+                summary_cache=self.summary_cache,
+                max_context_tokens=max_context_tokens
+            )
+            self.report_manager.progress.connect(self.on_report_progress)
+            self.report_manager.chunk.connect(self.handle_chunk)
+            self.report_manager.success.connect(self.handle_success)
+            self.report_manager.error.connect(self.handle_error)
+            self.start_report_task(self.report_manager)
+            self.report_manager.start(self.grouped_logs)
+            return
+
+        # 同一模型、提示词和提交内容已经总结过时直接使用缓存
+        cache_key = summary_key(api_model, prompt, git_log)
+        cached = self.summary_cache.get(cache_key)
+        if cached is not None:
+            self.show_report(cached)
+            return
+
         task = AITask(
             api_key,
             api_url,
             api_model,
             prompt,
-            git_log
+            git_log,
+            stream=True
         )
+        task.signals.chunk.connect(self.handle_chunk)
+        task.signals.success.connect(lambda reply: self.summary_cache.put(cache_key, reply))
         task.signals.success.connect(self.handle_success)
         task.signals.error.connect(self.handle_error)
+        self.start_report_task(task)
         self.thread_pool.start(task)
 
+    def start_report_task(self, task):
+        self.report_task = task
+        self.report_running = True
+        self.ui.progress.setFormat("%p%")
+        self.update_stop_button()
+
+    def on_report_progress(self, done, total):
+        self.ui.btn_ai_report.setText(f"分段总结中 ({done}/{total})...")
+        self.on_progress(done, total)
+
+    def on_author_report_progress(self, done, total):
+        self.ui.btn_ai_report.setText(f"按开发者生成中 ({done}/{total})...")
+        self.on_progress(done, total)
+
     def export_report(self):
         report_text = self.ui.pte_ai_report.toPlainText()
 
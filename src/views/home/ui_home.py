@@ -18,8 +18,9 @@ from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
 from PySide6.QtWidgets import (QAbstractSpinBox, QApplication, QComboBox, QDateEdit,
     QFrame, QGridLayout, QHBoxLayout, QHeaderView,
     QLabel, QPlainTextEdit, QProgressBar, QPushButton,
-    QSizePolicy, QSpacerItem, QToolButton, QTreeWidget,
-    QTreeWidgetItem, QVBoxLayout, QWidget)
+    QSizePolicy, QSpacerItem, QTabWidget, QTableView,
+    QToolButton, QTreeWidget, QTreeWidgetItem, QVBoxLayout,
+    QWidget)
 
 class Ui_Home(object):
     def setupUi(self, Home):
@@ -112,10 +113,46 @@ class Ui_Home(object):
         self.gridLayout_5 = QGridLayout(self.wgt_mid_content)
         self.gridLayout_5.setObjectName(u"gridLayout_5")
         self.gridLayout_5.setContentsMargins(0, 0, -1, -1)
-        self.pte_commit_log = QPlainTextEdit(self.wgt_mid_content)
+        self.tw_commit_log = QTabWidget(self.wgt_mid_content)
+        self.tw_commit_log.setObjectName(u"tw_commit_log")
+        self.tab_commit_table = QWidget()
+        self.tab_commit_table.setObjectName(u"tab_commit_table")
+        self.gridLayout_8 = QGridLayout(self.tab_commit_table)
+        self.gridLayout_8.setObjectName(u"gridLayout_8")
+        self.gridLayout_8.setContentsMargins(0, 0, 0, 0)
+        self.tv_commit_log = QTableView(self.tab_commit_table)
+        self.tv_commit_log.setObjectName(u"tv_commit_log")
+
+        self.gridLayout_8.addWidget(self.tv_commit_log, 0, 0, 1, 1)
+
+        self.tw_commit_log.addTab(self.tab_commit_table, "")
+        self.tab_commit_text = QWidget()
+        self.tab_commit_text.setObjectName(u"tab_commit_text")
+        self.gridLayout_9 = QGridLayout(self.tab_commit_text)
+        self.gridLayout_9.setObjectName(u"gridLayout_9")
+        self.gridLayout_9.setContentsMargins(0, 0, 0, 0)
+        self.pte_commit_log = QPlainTextEdit(self.tab_commit_text)
         self.pte_commit_log.setObjectName(u"pte_commit_log")
 
-        self.gridLayout_5.addWidget(self.pte_commit_log, 0, 0, 1, 1)
+        self.gridLayout_9.addWidget(self.pte_commit_log, 0, 0, 1, 1)
+
+        self.tw_commit_log.addTab(self.tab_commit_text, "")
+        self.tab_statistics = QWidget()
+        self.tab_statistics.setObjectName(u"tab_statistics")
+        self.gridLayout_10 = QGridLayout(self.tab_statistics)
+        self.gridLayout_10.setObjectName(u"gridLayout_10")
+        self.gridLayout_10.setContentsMargins(0, 0, 0, 0)
+        self.twgt_statistics = QTreeWidget(self.tab_statistics)
+        __qtreewidgetitem2 = QTreeWidgetItem()
+        __qtreewidgetitem2.setText(0, u"1");
+        self.twgt_statistics.setHeaderItem(__qtreewidgetitem2)
+        self.twgt_statistics.setObjectName(u"twgt_statistics")
+
+        self.gridLayout_10.addWidget(self.twgt_statistics, 0, 0, 1, 1)
+
+        self.tw_commit_log.addTab(self.tab_statistics, "")
+
+        self.gridLayout_5.addWidget(self.tw_commit_log, 0, 0, 1, 1)
 
 
         self.vbl_mid.addWidget(self.wgt_mid_content)
@@ -160,7 +197,7 @@ class Ui_Home(object):
         self.line_3.setFrameShape(QFrame.Shape.VLine)
         self.line_3.setFrameShadow(QFrame.Shadow.Sunken)
 
-        self.gridLayout.addWidget(self.line_3, 0, 13, 1, 1)
+        self.gridLayout.addWidget(self.line_3, 0, 14, 1, 1)
 
         self.line = QFrame(self.wgt_header)
         self.line.setObjectName(u"line")
@@ -182,7 +219,7 @@ class Ui_Home(object):
         self.btn_export = QPushButton(self.wgt_header)
         self.btn_export.setObjectName(u"btn_export")
 
-        self.gridLayout.addWidget(self.btn_export, 0, 17, 1, 1)
+        self.gridLayout.addWidget(self.btn_export, 0, 18, 1, 1)
 
         self.cbb_theme = QComboBox(self.wgt_header)
         self.cbb_theme.setObjectName(u"cbb_theme")
@@ -196,6 +233,11 @@ class Ui_Home(object):
 
         self.gridLayout.addWidget(self.line_2, 0, 2, 1, 1)
 
+        self.btn_stop = QPushButton(self.wgt_header)
+        self.btn_stop.setObjectName(u"btn_stop")
+
+        self.gridLayout.addWidget(self.btn_stop, 0, 12, 1, 1)
+
         self.btn_get = QPushButton(self.wgt_header)
         self.btn_get.setObjectName(u"btn_get")
 
@@ -209,11 +251,11 @@ class Ui_Home(object):
         self.btn_ai_report = QPushButton(self.wgt_header)
         self.btn_ai_report.setObjectName(u"btn_ai_report")
 
-        self.gridLayout.addWidget(self.btn_ai_report, 0, 15, 1, 1)
+        self.gridLayout.addWidget(self.btn_ai_report, 0, 16, 1, 1)
 
         self.horizontalSpacer = QSpacerItem(187, 20, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum)
 
-        self.gridLayout.addItem(self.horizontalSpacer, 0, 16, 1, 1)
+        self.gridLayout.addItem(self.horizontalSpacer, 0, 17, 1, 1)
 
         self.progress = QProgressBar(self.wgt_header)
         self.progress.setObjectName(u"progress")
@@ -231,7 +273,7 @@ class Ui_Home(object):
         self.btn_settings.setObjectName(u"btn_settings")
         self.btn_settings.setLayoutDirection(Qt.LayoutDirection.LeftToRight)
 
-        self.gridLayout.addWidget(self.btn_settings, 0, 14, 1, 1)
+        self.gridLayout.addWidget(self.btn_settings, 0, 15, 1, 1)
 
         self.label_3 = QLabel(self.wgt_header)
         self.label_3.setObjectName(u"label_3")
@@ -248,7 +290,7 @@ class Ui_Home(object):
         self.btn_filter.setObjectName(u"btn_filter")
         self.btn_filter.setLayoutDirection(Qt.LayoutDirection.LeftToRight)
 
-        self.gridLayout.addWidget(self.btn_filter, 0, 12, 1, 1)
+        self.gridLayout.addWidget(self.btn_filter, 0, 13, 1, 1)
 
         self.btn_homepage = QPushButton(self.wgt_header)
         self.btn_homepage.setObjectName(u"btn_homepage")
@@ -261,6 +303,9 @@ class Ui_Home(object):
 
         self.retranslateUi(Home)
 
+        self.tw_commit_log.setCurrentIndex(0)
+
+
         QMetaObject.connectSlotsByName(Home)
     # setupUi
 
@@ -270,8 +315,12 @@ class Ui_Home(object):
         self.btn_project_add.setText(QCoreApplication.translate("Home", u"+", None))
         self.btn_account_add.setText(QCoreApplication.translate("Home", u"+", None))
         self.label_2.setText(QCoreApplication.translate("Home", u"\u8d26\u53f7", None))
+        self.tw_commit_log.setTabText(self.tw_commit_log.indexOf(self.tab_commit_table), QCoreApplication.translate("Home", u"\u8868\u683c", None))
+        self.tw_commit_log.setTabText(self.tw_commit_log.indexOf(self.tab_commit_text), QCoreApplication.translate("Home", u"\u6587\u672c", None))
+        self.tw_commit_log.setTabText(self.tw_commit_log.indexOf(self.tab_statistics), QCoreApplication.translate("Home", u"\u7edf\u8ba1", None))
         self.btn_statistics.setText(QCoreApplication.translate("Home", u"\u6570\u636e\u7edf\u8ba1", None))
         self.btn_export.setText(QCoreApplication.translate("Home", u"\u590d\u5236", None))
+        self.btn_stop.setText(QCoreApplication.translate("Home", u"\u505c\u6b62", None))
         self.btn_get.setText(QCoreApplication.translate("Home", u"\u83b7\u53d6", None))
         self.label_4.setText(QCoreApplication.translate("Home", u"\u6570\u636e\u4fe1\u606f: ", None))
         self.btn_ai_report.setText(QCoreApplication.translate("Home", u"AI \u603b\u7ed3", None))
@@ -5,7 +5,10 @@ from PySide6.QtWidgets import QDialog, QMessageBox, QLineEdit
 from PySide6.QtCore import QThreadPool
 from PySide6.QtGui import QIcon
 from src.config.config import Config
+from src.config.prompts import DEFAULT_PROMPT
 from src.utils.ai_utils import AIKeyCheckTask
+from src.utils.ai_client import set_max_connections
+from src.utils.ai_scheduler import configure_scheduler
 
 
 class Settings(QDialog):
@@ -32,6 +35,15 @@ class Settings(QDialog):
         self.ui.le_address.setText(Config().get('settings/address', ''))
         self.ui.le_model.setText(Config().get('settings/model', ''))
         self.ui.pte_prompt.appendPlainText(Config().get('settings/prompt', ''))
+        self.ui.sb_fetch_threads.setValue(int(Config().get('settings/fetch_threads', 4)))
+        self.ui.sb_git_threads.setValue(int(Config().get('settings/git_threads', 0)))
+        self.ui.cbb_report_mode.setCurrentIndex(
+            1 if Config().get('settings/report_mode', 'single') == 'per_author' else 0
+        )
+        self.ui.sb_ai_threads.setValue(int(Config().get('settings/ai_threads', 4)))
+        self.ui.sb_ai_connections.setValue(int(Config().get('settings/ai_max_connections', 8)))
+        self.ui.sb_ai_rate_limit.setValue(int(Config().get('settings/ai_rate_limit', 0)))
+        self.ui.sb_ai_retries.setValue(int(Config().get('settings/ai_max_retries', 3)))
 
     def init_connect(self):
         self.ui.btn_check.clicked.connect(self.check_key)
@@ -89,58 +101,7 @@ class Settings(QDialog):
 
     def show_default_prompt(self):
         self.ui.pte_prompt.clear()
-        self.ui.pte_prompt.appendPlainText(
-'''
-你是一位经验丰富的项目经理兼技术文档撰写专家。请根据我提供的 Git 提交记录，为每位开发者撰写简洁、条理清晰的工作总结。总结将用于日常或阶段性工作汇报，请严格按照以下要求生成内容：
-
-提交记录包含以下字段：
-
-提交者
-
-提交时间
-
-项目名称
-
-分支名称
-
-提交信息（commit message）
-
-请按照以下要求进行整理和撰写：
-
-按照开发者对提交记录进行分类，为每位开发者分别撰写工作总结。
-
-合并和归纳提交信息，将内容整理为以下几类工作项：
-功能开发（标注为“功能开发”）
-Bug 修复（标注为“Bug 修复”）
-性能优化或功能改进（标注为“优化改进”）
-文档更新（标注为“文档更新”）
-
-用自然语言撰写总结内容，适当润色技术细节，使其更正式、更适合向团队或管理层汇报。
-
-根据提交时间自动判断汇报周期（日报、周报、月报、季度报或年报），并在总结中体现。
-
-输出为纯文本格式，不使用 Markdown 或特殊符号，保持清晰、简洁、可复制粘贴。
-
-请参照以下格式撰写总结：
-
-开发者：张三
-汇报周期：周报
-参与项目：项目 A、项目 B
-
-本周工作总结：
-
-功能开发：完成了项目 A 的登录功能开发，包含前端表单校验和后端接口联调。
-
-Bug 修复：解决了项目 B 中头像上传失败的问题，修复了文件权限配置。
-
-优化改进：优化了项目 A 的首页加载速度，引入延迟加载机制改善渲染性能。
-
-文档更新：补充了项目 A 接口文档的参数说明与错误码定义。
-
-现在请根据下面的 Git 提交记录，整理并输出符合上述格式的工作总结。
-
-（以下为提交信息）
-''')
+        self.ui.pte_prompt.appendPlainText(DEFAULT_PROMPT)
 
     def save_settings(self):
         Config().begin_group('settings')
@@ -148,5 +109,18 @@ Bug 修复：解决了项目 B 中头像上传失败的问题，修复了文件
         Config().set('address', self.ui.le_address.text())
         Config().set('model', self.ui.le_model.text())
         Config().set('prompt', self.ui.pte_prompt.toPlainText())
+        Config().set('fetch_threads', self.ui.sb_fetch_threads.value())
+        Config().set('git_threads', self.ui.sb_git_threads.value())
+        Config().set('report_mode', 'per_author' if self.ui.cbb_report_mode.currentIndex() == 1 else 'single')
+        Config().set('ai_threads', self.ui.sb_ai_threads.value())
+        Config().set('ai_max_connections', self.ui.sb_ai_connections.value())
+        Config().set('ai_rate_limit', self.ui.sb_ai_rate_limit.value())
+        Config().set('ai_max_retries', self.ui.sb_ai_retries.value())
         Config().end_group()
+        set_max_connections(self.ui.sb_ai_connections.value())
+        configure_scheduler(
+            self.ui.sb_ai_threads.value(),
+            self.ui.sb_ai_rate_limit.value(),
+            self.ui.sb_ai_retries.value()
+        )
         self.close()
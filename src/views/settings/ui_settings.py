@@ -15,9 +15,10 @@ from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
     QFont, QFontDatabase, QGradient, QIcon,
     QImage, QKeySequence, QLinearGradient, QPainter,
     QPalette, QPixmap, QRadialGradient, QTransform)
-from PySide6.QtWidgets import (QApplication, QDialog, QGridLayout, QGroupBox,
-    QLabel, QLineEdit, QPlainTextEdit, QPushButton,
-    QSizePolicy, QSpacerItem, QWidget)
+from PySide6.QtWidgets import (QApplication, QComboBox, QDialog, QGridLayout,
+    QGroupBox, QLabel, QLineEdit, QPlainTextEdit,
+    QPushButton, QSizePolicy, QSpacerItem, QSpinBox,
+    QWidget)
 
 class Ui_Settings(object):
     def setupUi(self, Settings):
@@ -36,7 +37,43 @@ class Ui_Settings(object):
         self.gridLayout_3.addWidget(self.pte_prompt, 0, 0, 1, 2)
 
 
-        self.gridLayout.addWidget(self.gb_prompt, 1, 0, 1, 1)
+        self.gridLayout.addWidget(self.gb_prompt, 2, 0, 1, 1)
+
+        self.gb_git = QGroupBox(Settings)
+        self.gb_git.setObjectName(u"gb_git")
+        self.gridLayout_4 = QGridLayout(self.gb_git)
+        self.gridLayout_4.setObjectName(u"gridLayout_4")
+        self.label_4 = QLabel(self.gb_git)
+        self.label_4.setObjectName(u"label_4")
+
+        self.gridLayout_4.addWidget(self.label_4, 0, 0, 1, 1)
+
+        self.sb_fetch_threads = QSpinBox(self.gb_git)
+        self.sb_fetch_threads.setObjectName(u"sb_fetch_threads")
+        self.sb_fetch_threads.setMinimum(1)
+        self.sb_fetch_threads.setMaximum(32)
+        self.sb_fetch_threads.setValue(4)
+
+        self.gridLayout_4.addWidget(self.sb_fetch_threads, 0, 1, 1, 1)
+
+        self.label_10 = QLabel(self.gb_git)
+        self.label_10.setObjectName(u"label_10")
+
+        self.gridLayout_4.addWidget(self.label_10, 1, 0, 1, 1)
+
+        self.sb_git_threads = QSpinBox(self.gb_git)
+        self.sb_git_threads.setObjectName(u"sb_git_threads")
+        self.sb_git_threads.setMaximum(64)
+        self.sb_git_threads.setValue(0)
+
+        self.gridLayout_4.addWidget(self.sb_git_threads, 1, 1, 1, 1)
+
+        self.horizontalSpacer_2 = QSpacerItem(40, 20, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum)
+
+        self.gridLayout_4.addItem(self.horizontalSpacer_2, 0, 2, 1, 1)
+
+
+        self.gridLayout.addWidget(self.gb_git, 1, 0, 1, 1)
 
         self.gb_settings = QGroupBox(Settings)
         self.gb_settings.setObjectName(u"gb_settings")
@@ -84,6 +121,68 @@ class Ui_Settings(object):
 
         self.gridLayout_5.addWidget(self.btn_show, 0, 2, 1, 1)
 
+        self.label_5 = QLabel(self.gb_settings)
+        self.label_5.setObjectName(u"label_5")
+
+        self.gridLayout_5.addWidget(self.label_5, 5, 0, 1, 1)
+
+        self.cbb_report_mode = QComboBox(self.gb_settings)
+        self.cbb_report_mode.addItem("")
+        self.cbb_report_mode.addItem("")
+        self.cbb_report_mode.setObjectName(u"cbb_report_mode")
+
+        self.gridLayout_5.addWidget(self.cbb_report_mode, 5, 1, 1, 2)
+
+        self.label_6 = QLabel(self.gb_settings)
+        self.label_6.setObjectName(u"label_6")
+
+        self.gridLayout_5.addWidget(self.label_6, 6, 0, 1, 1)
+
+        self.sb_ai_threads = QSpinBox(self.gb_settings)
+        self.sb_ai_threads.setObjectName(u"sb_ai_threads")
+        self.sb_ai_threads.setMinimum(1)
+        self.sb_ai_threads.setMaximum(16)
+        self.sb_ai_threads.setValue(4)
+
+        self.gridLayout_5.addWidget(self.sb_ai_threads, 6, 1, 1, 2)
+
+        self.label_7 = QLabel(self.gb_settings)
+        self.label_7.setObjectName(u"label_7")
+
+        self.gridLayout_5.addWidget(self.label_7, 7, 0, 1, 1)
+
+        self.sb_ai_connections = QSpinBox(self.gb_settings)
+        self.sb_ai_connections.setObjectName(u"sb_ai_connections")
+        self.sb_ai_connections.setMinimum(1)
+        self.sb_ai_connections.setMaximum(64)
+        self.sb_ai_connections.setValue(8)
+
+        self.gridLayout_5.addWidget(self.sb_ai_connections, 7, 1, 1, 2)
+
+        self.label_8 = QLabel(self.gb_settings)
+        self.label_8.setObjectName(u"label_8")
+
+        self.gridLayout_5.addWidget(self.label_8, 8, 0, 1, 1)
+
+        self.sb_ai_rate_limit = QSpinBox(self.gb_settings)
+        self.sb_ai_rate_limit.setObjectName(u"sb_ai_rate_limit")
+        self.sb_ai_rate_limit.setMaximum(10000)
+        self.sb_ai_rate_limit.setValue(0)
+
+        self.gridLayout_5.addWidget(self.sb_ai_rate_limit, 8, 1, 1, 2)
+
+        self.label_9 = QLabel(self.gb_settings)
+        self.label_9.setObjectName(u"label_9")
+
+        self.gridLayout_5.addWidget(self.label_9, 9, 0, 1, 1)
+
+        self.sb_ai_retries = QSpinBox(self.gb_settings)
+        self.sb_ai_retries.setObjectName(u"sb_ai_retries")
+        self.sb_ai_retries.setMaximum(10)
+        self.sb_ai_retries.setValue(3)
+
+        self.gridLayout_5.addWidget(self.sb_ai_retries, 9, 1, 1, 2)
+
 
         self.gridLayout.addWidget(self.gb_settings, 0, 0, 1, 1)
 
@@ -113,7 +212,7 @@ class Ui_Settings(object):
         self.gridLayout_2.addWidget(self.btn_default, 0, 0, 1, 1)
 
 
-        self.gridLayout.addWidget(self.gb_footer, 2, 0, 1, 1)
+        self.gridLayout.addWidget(self.gb_footer, 3, 0, 1, 1)
 
 
         self.retranslateUi(Settings)
@@ -124,12 +223,28 @@ class Ui_Settings(object):
     def retranslateUi(self, Settings):
         Settings.setWindowTitle(QCoreApplication.translate("Settings", u"Dialog", None))
         self.gb_prompt.setTitle(QCoreApplication.translate("Settings", u"\u63d0\u793a\u8bcd", None))
+        self.gb_git.setTitle(QCoreApplication.translate("Settings", u"Git \u8bbe\u7f6e", None))
+        self.label_4.setText(QCoreApplication.translate("Settings", u"\u5e76\u884c\u62c9\u53d6\u6570", None))
+        self.label_10.setText(QCoreApplication.translate("Settings", u"\u5e76\u884c\u6536\u96c6\u6570", None))
+#if QT_CONFIG(tooltip)
+        self.sb_git_threads.setToolTip(QCoreApplication.translate("Settings", u"\u540c\u65f6\u6267\u884c git log \u7684\u6700\u5927\u9879\u76ee\u6570\uff0c\u5b9e\u9645\u5e76\u53d1\u4f1a\u6839\u636e\u8017\u65f6\u81ea\u52a8\u8c03\u6574", None))
+#endif // QT_CONFIG(tooltip)
+        self.sb_git_threads.setSpecialValueText(QCoreApplication.translate("Settings", u"\u81ea\u52a8", None))
         self.gb_settings.setTitle(QCoreApplication.translate("Settings", u"AI \u8bbe\u7f6e", None))
         self.label_2.setText(QCoreApplication.translate("Settings", u"API \u5730\u5740", None))
         self.btn_check.setText(QCoreApplication.translate("Settings", u"\u68c0\u67e5", None))
         self.label.setText(QCoreApplication.translate("Settings", u"API \u5bc6\u94a5", None))
         self.label_3.setText(QCoreApplication.translate("Settings", u"\u6a21\u578b", None))
         self.btn_show.setText(QCoreApplication.translate("Settings", u"\u663e\u793a", None))
+        self.label_5.setText(QCoreApplication.translate("Settings", u"\u751f\u6210\u65b9\u5f0f", None))
+        self.cbb_report_mode.setItemText(0, QCoreApplication.translate("Settings", u"\u6574\u4f53\u751f\u6210", None))
+        self.cbb_report_mode.setItemText(1, QCoreApplication.translate("Settings", u"\u6309\u5f00\u53d1\u8005\u5e76\u884c\u751f\u6210", None))
+
+        self.label_6.setText(QCoreApplication.translate("Settings", u"\u5e76\u884c\u8bf7\u6c42\u6570", None))
+        self.label_7.setText(QCoreApplication.translate("Settings", u"\u6700\u5927\u8fde\u63a5\u6570", None))
+        self.label_8.setText(QCoreApplication.translate("Settings", u"\u6bcf\u5206\u949f\u8bf7\u6c42\u6570", None))
+        self.sb_ai_rate_limit.setSpecialValueText(QCoreApplication.translate("Settings", u"\u4e0d\u9650", None))
+        self.label_9.setText(QCoreApplication.translate("Settings", u"\u5931\u8d25\u91cd\u8bd5\u6b21\u6570", None))
         self.btn_close.setText(QCoreApplication.translate("Settings", u"\u5173\u95ed", None))
         self.btn_save.setText(QCoreApplication.translate("Settings", u"\u4fdd\u5b58", None))
         self.btn_default.setText(QCoreApplication.translate("Settings", u"\u9ed8\u8ba4\u63d0\u793a\u8bcd", None))
@@ -0,0 +1,31 @@
+from src.utils.git_log_worker import AdaptiveLimit
+
+
+def feed(limit, latency, count):
+    for _ in range(count):
+        result = limit.update(latency)
+    return result
+
+
+def test_first_sample_does_not_grow():
+    limit = AdaptiveLimit(16)
+    assert limit.update(0.05) == 8
+
+
+def test_steady_latency_grows_to_max():
+    limit = AdaptiveLimit(16)
+    assert feed(limit, 0.05, 10) == 16
+
+
+def test_uniform_slowdown_shrinks():
+    limit = AdaptiveLimit(16)
+    feed(limit, 0.05, 10)
+    assert feed(limit, 0.15, 3) < 16
+    assert limit.limit >= 1
+
+
+def test_recovers_after_slowdown():
+    limit = AdaptiveLimit(16)
+    feed(limit, 0.05, 10)
+    shrunk = feed(limit, 0.15, 3)
+    assert feed(limit, 0.15, 20) > shrunk
@@ -0,0 +1,81 @@
+import os
+import subprocess
+from datetime import date
+
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+from src.utils.commit_cache import CommitCache
+from src.utils.date_range import git_time_range
+from src.utils.git_log_worker import GitLogSignals, GitLogTask, RefIndex
+
+AUTHORS = ['alice', 'bob']
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """main 上有 alice、bob 的提交，feature 从 main 分出后两边各自继续提交"""
+    path = tmp_path / 'repo'
+    path.mkdir()
+    clock = iter(range(1752570000, 1752570000 + 100 * 3600, 3600))
+
+    def git(*args, author='alice'):
+        timestamp = f'{next(clock)} +0800'
+        env = dict(os.environ, GIT_AUTHOR_NAME=author, GIT_AUTHOR_EMAIL=f'{author}@example.com',
+                   GIT_COMMITTER_NAME=author, GIT_COMMITTER_EMAIL=f'{author}@example.com',
+                   GIT_AUTHOR_DATE=timestamp, GIT_COMMITTER_DATE=timestamp)
+        subprocess.run(['git', *args], cwd=path, env=env, check=True, capture_output=True)
+
+    def commit(message, author='alice'):
+        (path / 'file.txt').write_text(message, encoding='utf-8')
+        git('add', 'file.txt', author=author)
+        git('commit', '-m', message, author=author)
+
+    git('init', '-b', 'main')
+    for i in range(1, 4):
+        commit(f'alice {i}')
+    commit('bob 1', author='bob')
+    git('checkout', '-b', 'feature')
+    commit('alice feature 1')
+    commit('bob feature 1', author='bob')
+    git('checkout', 'main')
+    commit('alice 4')
+    return str(path)
+
+
+def collect(repo, branches, commit_cache=None):
+    since, until = git_time_range(date(2000, 1, 1), date(2030, 1, 1))
+    signals = GitLogSignals()
+    grouped = {}
+    errors = []
+    signals.batch.connect(lambda project, batch: [
+        grouped.setdefault(key, []).extend(log.message for log in logs) for key, logs in batch.items()
+    ])
+    signals.error.connect(errors.append)
+    GitLogTask(repo, 'p', branches, AUTHORS, since, until, signals, commit_cache=commit_cache).run()
+    assert not errors
+    return {key: sorted(messages) for key, messages in grouped.items()}
+
+
+@pytest.mark.parametrize('branches', [['feature', 'main'], ['main', 'feature']])
+def test_cache_and_live_walk_group_commits_the_same(app, repo, tmp_path, branches):
+    live = collect(repo, branches)
+    cache = CommitCache(str(tmp_path / 'commits.db'))
+    # 首次查询时分支尚未缓存，仍直接读取 git log
+    assert collect(repo, branches, cache) == live
+    # 建立缓存后从缓存中查询
+    assert cache.sync(repo, RefIndex.load(repo), branches, full=False) == branches
+    cache.sync(repo, RefIndex.load(repo), branches)
+    assert cache.sync(repo, RefIndex.load(repo), branches, full=False) == []
+    assert collect(repo, branches, cache) == live
+
+    # 公共历史归入排在前面的分支
+    first, second = branches
+    shared = {'alice 1', 'alice 2', 'alice 3'}
+    assert shared <= set(live[(first, 'alice')])
+    assert not shared & set(live[(second, 'alice')])